@@ -5,30 +5,40 @@ Compares Stichotrope overhead with cProfile for function-level profiling.
 Tests SECONDARY success criterion: Competitive with cProfile.
 """
 
+import os
+import sys
 import time
-import timeit
-import statistics
+from array import array
 import cProfile
 import pstats
 from io import StringIO
 from stichotrope import Profiler
 
+# Add parent directory to path, for the shared benchmark helpers
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-def simulate_work(duration_ms: float):
-    """Simulate work by sleeping for specified duration."""
-    time.sleep(duration_ms / 1000.0)
+from benchmarks.timing import measure_times, summarize_times
+
+_sleep = time.sleep
+
+
+def simulate_work(duration_s: float):
+    """Simulate work by sleeping for specified duration (in seconds)."""
+    _sleep(duration_s)
 
 
 def create_workload_functions(duration_ms: float):
     """Create a set of functions to profile."""
+    duration_s = duration_ms / 1000.0
+
     def func_a():
-        simulate_work(duration_ms)
+        simulate_work(duration_s)
 
     def func_b():
-        simulate_work(duration_ms)
+        simulate_work(duration_s)
 
     def func_c():
-        simulate_work(duration_ms)
+        simulate_work(duration_s)
 
     def main():
         func_a()
@@ -42,25 +52,25 @@ def benchmark_unprofiled(duration_ms: float, iterations: int = 50):
     """Benchmark unprofiled execution."""
     main, _, _, _ = create_workload_functions(duration_ms)
 
-    times = timeit.repeat(main, repeat=iterations, number=1)
-    return times
+    return measure_times(main, iterations)
 
 
 def benchmark_stichotrope(duration_ms: float, iterations: int = 50):
     """Benchmark Stichotrope profiled execution."""
     profiler = Profiler("ComparisonTest")
+    duration_s = duration_ms / 1000.0
 
     @profiler.track(0, "func_a")
     def func_a():
-        simulate_work(duration_ms)
+        simulate_work(duration_s)
 
     @profiler.track(0, "func_b")
     def func_b():
-        simulate_work(duration_ms)
+        simulate_work(duration_s)
 
     @profiler.track(0, "func_c")
     def func_c():
-        simulate_work(duration_ms)
+        simulate_work(duration_s)
 
     @profiler.track(0, "main")
     def main():
@@ -68,32 +78,36 @@ def benchmark_stichotrope(duration_ms: float, iterations: int = 50):
         func_b()
         func_c()
 
-    times = timeit.repeat(main, repeat=iterations, number=1)
-    return times
+    return measure_times(main, iterations)
 
 
 def benchmark_cprofile(duration_ms: float, iterations: int = 50):
     """Benchmark cProfile profiled execution."""
     main, _, _, _ = create_workload_functions(duration_ms)
 
-    times = []
-    for _ in range(iterations):
-        profiler = cProfile.Profile()
-        start = time.perf_counter()
-        profiler.runcall(main)
-        end = time.perf_counter()
-        times.append(end - start)
+    # One profiler reused across iterations, like benchmark_stichotrope
+    profiler = cProfile.Profile()
+    times = array("q", [0] * iterations)
+    now = time.perf_counter_ns
+    for i in range(iterations):
+        profiler.clear()
+        start = now()
+        profiler.enable()
+        main()
+        profiler.disable()
+        times[i] = now() - start
 
     return times
 
 
 def calculate_stats(times):
-    """Calculate timing statistics."""
+    """Calculate timing statistics in seconds from per-call times in nanoseconds."""
+    mean, std, lowest, highest = summarize_times(times)
     return {
-        "mean": statistics.mean(times),
-        "std": statistics.stdev(times),
-        "min": min(times),
-        "max": max(times),
+        "mean": mean / 1e9,
+        "std": std / 1e9,
+        "min": lowest / 1e9,
+        "max": highest / 1e9,
     }
 
 
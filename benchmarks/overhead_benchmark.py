@@ -5,54 +5,67 @@ Measures profiler overhead for different workload durations.
 Tests PRIMARY success criterion: ≤10% overhead for ≥1ms blocks.
 """
 
+import os
+import sys
 import time
-import timeit
-import statistics
 from stichotrope import Profiler
 
+# Add parent directory to path, for the shared benchmark helpers
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-def simulate_work(duration_ms: float):
-    """Simulate work by sleeping for specified duration."""
-    time.sleep(duration_ms / 1000.0)
+from benchmarks.timing import measure_times, summarize_times
+
+_sleep = time.sleep
+
+
+def simulate_work(duration_s: float):
+    """Simulate work by sleeping for specified duration (in seconds)."""
+    _sleep(duration_s)
 
 
 def benchmark_unprofiled(duration_ms: float, iterations: int = 100):
     """Benchmark unprofiled execution."""
+    duration_s = duration_ms / 1000.0
+
     def workload():
-        simulate_work(duration_ms)
+        simulate_work(duration_s)
 
-    times = timeit.repeat(workload, repeat=iterations, number=1)
-    return times
+    return measure_times(workload, iterations)
 
 
 def benchmark_profiled_decorator(duration_ms: float, iterations: int = 100):
     """Benchmark profiled execution using decorator."""
     profiler = Profiler("OverheadTest")
+    duration_s = duration_ms / 1000.0
 
     @profiler.track(0, f"work_{duration_ms}ms")
     def workload():
-        simulate_work(duration_ms)
+        simulate_work(duration_s)
 
-    times = timeit.repeat(workload, repeat=iterations, number=1)
-    return times
+    return measure_times(workload, iterations)
 
 
 def benchmark_profiled_context_manager(duration_ms: float, iterations: int = 100):
     """Benchmark profiled execution using context manager."""
     profiler = Profiler("OverheadTest")
+    duration_s = duration_ms / 1000.0
+    block_name = f"work_{duration_ms}ms"
 
     def workload():
-        with profiler.block(0, f"work_{duration_ms}ms"):
-            simulate_work(duration_ms)
+        with profiler.block(0, block_name):
+            simulate_work(duration_s)
 
-    times = timeit.repeat(workload, repeat=iterations, number=1)
-    return times
+    return measure_times(workload, iterations)
 
 
 def calculate_overhead(baseline_times, profiled_times):
-    """Calculate overhead statistics."""
-    baseline_mean = statistics.mean(baseline_times)
-    profiled_mean = statistics.mean(profiled_times)
+    """Calculate overhead statistics from per-call times in nanoseconds."""
+    baseline_mean, baseline_std, _, _ = summarize_times(baseline_times)
+    profiled_mean, profiled_std, _, _ = summarize_times(profiled_times)
+
+    # Report in seconds
+    baseline_mean, baseline_std = baseline_mean / 1e9, baseline_std / 1e9
+    profiled_mean, profiled_std = profiled_mean / 1e9, profiled_std / 1e9
 
     overhead_ns = (profiled_mean - baseline_mean) * 1e9
     overhead_pct = (profiled_mean - baseline_mean) / baseline_mean * 100
@@ -64,8 +77,8 @@ def calculate_overhead(baseline_times, profiled_times):
         "overhead_ns": overhead_ns,
         "overhead_pct": overhead_pct,
         "slowdown_factor": slowdown_factor,
-        "baseline_std": statistics.stdev(baseline_times),
-        "profiled_std": statistics.stdev(profiled_times),
+        "baseline_std": baseline_std,
+        "profiled_std": profiled_std,
     }
 
 
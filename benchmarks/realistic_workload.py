@@ -5,9 +5,10 @@ Demonstrates multi-track profiling value with a realistic web application scenar
 Tests PRIMARY success criterion: Multi-track organization provides clear value.
 """
 
+import heapq
 import time
 import random
-from stichotrope import Profiler
+from stichotrope import Profiler, export_csv, export_json, print_results
 
 
 # Track definitions
@@ -16,90 +17,110 @@ TRACK_DATABASE = 1
 TRACK_BUSINESS_LOGIC = 2
 TRACK_IO = 3
 
+# Duration range (ms) of each simulated operation
+DURATION_RANGES_MS = {
+    "fetch_user": (2, 5),
+    "fetch_products": (5, 10),
+    "update_user_activity": (1, 3),
+    "calculate_recommendations": (10, 20),
+    "apply_pricing_rules": (5, 10),
+    "validate_inventory": (3, 7),
+    "load_user_preferences": (1, 3),
+    "cache_results": (2, 4),
+    "send_analytics": (5, 15),
+}
+
+_sleep = time.sleep
+
+
+def generate_durations(num_requests: int, rng: random.Random):
+    """Pre-generate the duration (ms) of every simulated operation for each request."""
+    return {
+        name: [rng.uniform(low, high) for _ in range(num_requests)]
+        for name, (low, high) in DURATION_RANGES_MS.items()
+    }
+
 
 def simulate_database_query(query_type: str, duration_ms: float):
     """Simulate a database query."""
-    time.sleep(duration_ms / 1000.0)
+    _sleep(duration_ms * 0.001)
 
 
 def simulate_computation(duration_ms: float):
     """Simulate CPU-intensive computation."""
-    time.sleep(duration_ms / 1000.0)
+    _sleep(duration_ms * 0.001)
 
 
 def simulate_file_io(duration_ms: float):
     """Simulate file I/O operation."""
-    time.sleep(duration_ms / 1000.0)
+    _sleep(duration_ms * 0.001)
 
 
 def simulate_network_io(duration_ms: float):
     """Simulate network I/O operation."""
-    time.sleep(duration_ms / 1000.0)
+    _sleep(duration_ms * 0.001)
 
 
 class WebApplication:
     """Simulated web application with multi-track profiling."""
 
-    def __init__(self, profiler: Profiler):
+    def __init__(self, profiler: Profiler, durations):
         self.profiler = profiler
+        self._durations = durations  # operation name -> duration (ms) per request
+        self._request_idx = 0
 
-    @property
-    def track(self):
-        """Convenience property for decorator access."""
-        return self.profiler.track
-
-    @property
-    def block(self):
-        """Convenience property for context manager access."""
-        return self.profiler.block
+        # Convenience bindings for decorator and context manager access
+        self.track = profiler.track
+        self.block = profiler.block
 
     def fetch_user(self, user_id: int):
         """Fetch user from database."""
         with self.block(TRACK_DATABASE, "fetch_user"):
-            simulate_database_query("SELECT", random.uniform(2, 5))
+            simulate_database_query("SELECT", self._durations["fetch_user"][self._request_idx])
 
     def fetch_products(self, category: str):
         """Fetch products from database."""
         with self.block(TRACK_DATABASE, "fetch_products"):
-            simulate_database_query("SELECT", random.uniform(5, 10))
+            simulate_database_query("SELECT", self._durations["fetch_products"][self._request_idx])
 
     def update_user_activity(self, user_id: int):
         """Update user activity log."""
         with self.block(TRACK_DATABASE, "update_user_activity"):
-            simulate_database_query("UPDATE", random.uniform(1, 3))
+            simulate_database_query("UPDATE", self._durations["update_user_activity"][self._request_idx])
 
     def calculate_recommendations(self, user_data, product_data):
         """Calculate product recommendations."""
         with self.block(TRACK_BUSINESS_LOGIC, "calculate_recommendations"):
-            simulate_computation(random.uniform(10, 20))
+            simulate_computation(self._durations["calculate_recommendations"][self._request_idx])
 
     def apply_pricing_rules(self, products):
         """Apply pricing rules to products."""
         with self.block(TRACK_BUSINESS_LOGIC, "apply_pricing_rules"):
-            simulate_computation(random.uniform(5, 10))
+            simulate_computation(self._durations["apply_pricing_rules"][self._request_idx])
 
     def validate_inventory(self, products):
         """Validate product inventory."""
         with self.block(TRACK_BUSINESS_LOGIC, "validate_inventory"):
-            simulate_computation(random.uniform(3, 7))
+            simulate_computation(self._durations["validate_inventory"][self._request_idx])
 
     def load_user_preferences(self, user_id: int):
         """Load user preferences from file."""
         with self.block(TRACK_IO, "load_user_preferences"):
-            simulate_file_io(random.uniform(1, 3))
+            simulate_file_io(self._durations["load_user_preferences"][self._request_idx])
 
     def cache_results(self, data):
         """Cache results to file."""
         with self.block(TRACK_IO, "cache_results"):
-            simulate_file_io(random.uniform(2, 4))
+            simulate_file_io(self._durations["cache_results"][self._request_idx])
 
     def send_analytics(self, event_data):
         """Send analytics to external service."""
         with self.block(TRACK_IO, "send_analytics"):
-            simulate_network_io(random.uniform(5, 15))
+            simulate_network_io(self._durations["send_analytics"][self._request_idx])
 
-    def handle_product_listing_request(self, user_id: int, category: str):
+    def handle_product_listing_request(self, request_idx: int, user_id: int, category: str):
         """Handle a product listing request (main entry point)."""
+        self._request_idx = request_idx
         with self.block(TRACK_REQUEST, "handle_product_listing_request"):
             # Fetch data
             self.fetch_user(user_id)
@@ -120,8 +141,8 @@ class WebApplication:
             self.send_analytics({"user": user_id, "category": category})
 
 
-def run_realistic_workload():
-    """Run realistic multi-track workload."""
+def run_realistic_workload(seed: int = 42):
+    """Run realistic multi-track workload (reproducible for a given seed)."""
     print("="*80)
     print("REALISTIC MULTI-TRACK WORKLOAD")
     print("="*80)
@@ -139,34 +160,43 @@ def run_realistic_workload():
     profiler.set_track_name(TRACK_BUSINESS_LOGIC, "Business Logic")
     profiler.set_track_name(TRACK_IO, "I/O Operations")
 
+    # Simulate requests, drawing every random value up front
+    num_requests = 10
+    rng = random.Random(seed)
+    durations = generate_durations(num_requests, rng)
+    requests = [
+        (rng.randint(1, 100), rng.choice(["electronics", "books", "clothing", "food"]))
+        for _ in range(num_requests)
+    ]
+
     # Create application
-    app = WebApplication(profiler)
+    app = WebApplication(profiler, durations)
 
-    # Simulate requests
-    num_requests = 10
     print(f"\nProcessing {num_requests} requests...")
 
-    start_time = time.perf_counter()
+    start_ns = time.perf_counter_ns()
 
-    for i in range(num_requests):
-        user_id = random.randint(1, 100)
-        category = random.choice(["electronics", "books", "clothing", "food"])
-        app.handle_product_listing_request(user_id, category)
+    for i, (user_id, category) in enumerate(requests):
+        app.handle_product_listing_request(i, user_id, category)
 
-    end_time = time.perf_counter()
-    total_time = end_time - start_time
+    total_time = (time.perf_counter_ns() - start_ns) / 1e9
 
     print(f"Completed in {total_time:.2f} seconds")
 
+    # Snapshot the results once for printing, export and analysis
+    results = profiler.get_results()
+
     # Print results
     print("\n" + "="*80)
     print("PROFILING RESULTS")
     print("="*80)
-    profiler.print_results()
+    print_results(results)
 
     # Export results
-    profiler.export_csv("realistic_workload_results.csv")
-    profiler.export_json("realistic_workload_results.json")
+    with open("realistic_workload_results.csv", "w", newline="") as f:
+        export_csv(results, f)
+    with open("realistic_workload_results.json", "w") as f:
+        export_json(results, f)
 
     print("\nResults exported to:")
     print("  - realistic_workload_results.csv")
@@ -177,30 +207,31 @@ def run_realistic_workload():
     print("MULTI-TRACK VALUE ANALYSIS")
     print("="*80)
 
-    results = profiler.get_results()
+    # Single pass over all blocks: per-track totals and block rows
+    track_totals = {}
+    all_blocks = []
+    for track_idx, track in results.tracks.items():
+        track_total = 0
+        for block in track.blocks.values():
+            track_total += block.total_time_ns
+            all_blocks.append((block.total_time_ns, block.hit_count, track.track_name, block.name))
+        track_totals[track_idx] = track_total
+    total_time_ns = sum(track_totals.values())
 
     # Calculate track percentages
-    total_time_ns = results.total_time_ns
-
     print("\nTime Distribution by Track:")
-    for track_idx in sorted(results.tracks.keys()):
-        track = results.tracks[track_idx]
-        track_pct = (track.total_time_ns / total_time_ns * 100) if total_time_ns > 0 else 0.0
-        print(f"  {track.track_name:<25} {track_pct:>6.2f}%")
+    for track_idx in sorted(track_totals):
+        track_pct = (track_totals[track_idx] / total_time_ns * 100) if total_time_ns > 0 else 0.0
+        print(f"  {results.tracks[track_idx].track_name:<25} {track_pct:>6.2f}%")
 
-    # Identify bottlenecks
+    # Identify bottlenecks: partial selection instead of sorting every block
     print("\nTop 5 Bottlenecks (by total time):")
-    all_blocks = []
-    for track in results.tracks.values():
-        for block in track.blocks.values():
-            all_blocks.append((track.track_name, block))
-
-    all_blocks.sort(key=lambda x: x[1].total_time_ns, reverse=True)
+    top_blocks = heapq.nlargest(5, all_blocks, key=lambda row: row[0])
 
-    for i, (track_name, block) in enumerate(all_blocks[:5], 1):
-        block_pct = (block.total_time_ns / total_time_ns * 100) if total_time_ns > 0 else 0.0
-        print(f"  {i}. [{track_name}] {block.name}")
-        print(f"     Total: {block.total_time_ns / 1e6:.2f} ms ({block_pct:.2f}%), Hits: {block.hit_count}")
+    for i, (block_total, hit_count, track_name, block_name) in enumerate(top_blocks, 1):
+        block_pct = (block_total / total_time_ns * 100) if total_time_ns > 0 else 0.0
+        print(f"  {i}. [{track_name}] {block_name}")
+        print(f"     Total: {block_total / 1e6:.2f} ms ({block_pct:.2f}%), Hits: {hit_count}")
 
     # Multi-track value assessment
     print("\n" + "="*80)
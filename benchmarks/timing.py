@@ -0,0 +1,38 @@
+"""
+Timing Helpers for the Benchmarks
+
+Per-call timing loop and summary statistics shared by the benchmark scripts.
+"""
+
+import time
+from array import array
+
+
+def measure_times(fn, iterations):
+    """Time iterations calls of fn, returning per-call durations in integer nanoseconds."""
+    times = array("q", [0] * iterations)
+    now = time.perf_counter_ns
+    for i in range(iterations):
+        start = now()
+        fn()
+        times[i] = now() - start
+    return times
+
+
+def summarize_times(times):
+    """Return (mean, sample std dev, min, max) of times in a single Welford pass."""
+    count = 0
+    mean = 0.0
+    m2 = 0.0
+    lowest = highest = times[0]
+    for value in times:
+        count += 1
+        delta = value - mean
+        mean += delta / count
+        m2 += delta * (value - mean)
+        if value < lowest:
+            lowest = value
+        elif value > highest:
+            highest = value
+    std = (m2 / (count - 1)) ** 0.5 if count > 1 else 0.0
+    return mean, std, lowest, highest
@@ -23,6 +23,7 @@ Example usage:
 
 from stichotrope.export import export_csv, export_json, format_time_ns, print_results
 from stichotrope.profiler import Profiler, is_global_enabled, set_global_enabled
+from stichotrope.sampling import SamplingProfiler
 from stichotrope.types import ProfileBlock, ProfilerResults, ProfileTrack
 
 try:
@@ -36,6 +37,7 @@ except Exception:
 __all__ = [
     "__version__",
     "Profiler",
+    "SamplingProfiler",
     "ProfileBlock",
     "ProfileTrack",
     "ProfilerResults",
@@ -5,6 +5,7 @@ Provides CSV, JSON, and console output formats.
 """
 
 import csv
+import functools
 import json
 from io import StringIO
 from typing import Any, Optional, TextIO
@@ -26,8 +27,9 @@ def export_csv(results: ProfilerResults, file: Optional[TextIO] = None) -> str:
     Returns:
         CSV string if file is None, otherwise empty string
     """
-    output = StringIO()
-    writer = csv.writer(output)
+    # Rows go straight to the destination file; the buffer is only filled for the string result
+    buffer = StringIO()
+    writer = csv.writer(file if file is not None else buffer)
 
     # Write header
     writer.writerow(
@@ -47,11 +49,12 @@ def export_csv(results: ProfilerResults, file: Optional[TextIO] = None) -> str:
     # Calculate total time across all tracks
     total_time_all = results.total_time_ns
 
-    # Write data rows
+    # Write data rows, one writerows() call per track
     for track_idx in sorted(results.tracks.keys()):
         track = results.tracks[track_idx]
         track_total_time = track.total_time_ns
 
+        rows = []
         for block_idx in sorted(track.blocks.keys()):
             block = track.blocks[block_idx]
 
@@ -64,8 +67,8 @@ def export_csv(results: ProfilerResults, file: Optional[TextIO] = None) -> str:
             # Handle min_time_ns initialization value
             min_time = block.min_time_ns if block.hit_count > 0 else 0
 
-            writer.writerow(
-                [
+            rows.append(
+                (
                     track_idx,
                     block.name,
                     block.hit_count,
@@ -75,16 +78,12 @@ def export_csv(results: ProfilerResults, file: Optional[TextIO] = None) -> str:
                     block.max_time_ns,
                     f"{pct_track:.2f}",
                     f"{pct_total:.2f}",
-                ]
+                )
             )
+        writer.writerows(rows)
 
-    csv_str = output.getvalue()
-
-    if file is not None:
-        file.write(csv_str)
-        return ""
-    else:
-        return csv_str
+    # Empty when writing to a file
+    return buffer.getvalue()
 
 
 def export_json(results: ProfilerResults, file: Optional[TextIO] = None, indent: int = 2) -> str:
@@ -153,7 +152,8 @@ def export_json(results: ProfilerResults, file: Optional[TextIO] = None, indent:
 
         data["tracks"].append(track_data)
 
-    json_str = json.dumps(data, indent=indent)
+    # The data is a freshly built tree of dicts and lists, so skip cycle detection
+    json_str = json.dumps(data, indent=indent, check_circular=False)
 
     if file is not None:
         file.write(json_str)
@@ -162,6 +162,9 @@ def export_json(results: ProfilerResults, file: Optional[TextIO] = None, indent:
         return json_str
 
 
+# Memoized: print_results() formats four times per block, and zero, min and max values
+# repeat across rows (sampled results in particular share many identical times)
+@functools.lru_cache(maxsize=4096)
 def format_time_ns(time_ns: int) -> str:
     """
     Format nanoseconds to human-readable time units.
@@ -198,9 +201,11 @@ def print_results(results: ProfilerResults) -> None:
     for track_idx in sorted(results.tracks.keys()):
         track = results.tracks[track_idx]
         track_name = track.track_name if track.track_name else f"Track {track_idx}"
+        # Sum the track once; the property walks every block on each access
+        track_total_time = track.total_time_ns
 
         print(f"\n{track_name} (Track {track_idx})")
-        print(f"  Total Time: {format_time_ns(track.total_time_ns)}")
+        print(f"  Total Time: {format_time_ns(track_total_time)}")
         print(f"  Total Hits: {track.total_hits:,}")
         print("-" * 120)
 
@@ -216,9 +221,7 @@ def print_results(results: ProfilerResults) -> None:
 
             # Calculate percentage of track
             pct_track = (
-                (block.total_time_ns / track.total_time_ns * 100)
-                if track.total_time_ns > 0
-                else 0.0
+                (block.total_time_ns / track_total_time * 100) if track_total_time > 0 else 0.0
             )
 
             # Handle min_time_ns initialization value
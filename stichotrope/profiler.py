@@ -3,22 +3,56 @@ Core Profiler implementation for Stichotrope.
 
 Provides the main Profiler class with multi-track support, runtime enable/disable,
 and call-site caching.
+
+Block statistics are stored as a Structure-of-Arrays: parallel int64 arrays (hits,
+total, min, max) indexed by a small integer block id assigned once per call site.
+Recording a measurement is a handful of indexed integer stores; ProfileTrack and
+ProfileBlock objects are only built on demand by get_results().
+
+Each thread records into its own set of arrays (see _ThreadData), reached through a
+threading.local, so the recording path takes no lock and threads never overwrite
+each other's counts. get_results() merges the arrays of every thread that recorded;
+when a thread exits, its arrays are folded into a shared "retired" set, so the
+registry only holds the threads that are still alive.
 """
 
 import functools
-import inspect
-from collections.abc import Generator
-from contextlib import contextmanager
+import operator
+import os
+import sys
+import threading
+import weakref
+from array import array
+from contextlib import AbstractContextManager
+from types import CodeType, TracebackType
 from typing import Any, Callable, Optional
 
 from stichotrope.timing import get_time_ns
-from stichotrope.types import ProfilerResults, ProfileTrack
+from stichotrope.types import ProfileBlock, ProfilerResults, ProfileTrack
+
+# Global enable/disable flag (module-level). Setting STICHOTROPE_DISABLED=1 in the
+# environment starts with profiling off, so decorators applied at import time are
+# identity functions and production code pays nothing per call.
+_PROFILER_ENABLED = os.environ.get("STICHOTROPE_DISABLED", "").lower() not in (
+    "1",
+    "true",
+    "yes",
+    "on",
+)
+
+# Code flags of functions taking *args / **kwargs (inspect.CO_VARARGS / CO_VARKEYWORDS)
+_CO_VARARGS = 0x04
+_CO_VARKEYWORDS = 0x08
+
+# Initial value of a block's min time (max int64), as in ProfileBlock
+_MIN_TIME_INIT = 2**63 - 1
 
-# Global enable/disable flag (module-level)
-_PROFILER_ENABLED = True
+# Fixed-point unit for sampling credits: a block earns round(sample_rate * unit)
+# credit per entry and is timed each time its credit reaches one unit
+_SAMPLE_UNIT = 2**32
 
-# Global call-site cache: (track_idx, file, line, name) -> (profiler_id, block_idx)
-_CALL_SITE_CACHE: dict[tuple[int, str, int, str], tuple[int, int]] = {}
+# Start time stored by a sampled block context for an entry that is not timed
+_UNSAMPLED = -1
 
 # Global profiler registry: profiler_id -> Profiler instance
 _PROFILER_REGISTRY: dict[int, "Profiler"] = {}
@@ -29,13 +63,17 @@ def set_global_enabled(enabled: bool) -> None:
     """
     Enable or disable profiling globally across all profiler instances.
 
-    When disabled, decorators return identity functions (zero overhead).
+    When disabled, decorators return identity functions (zero overhead), and
+    functions decorated earlier stop recording until profiling is re-enabled. The
+    initial state can be set with the STICHOTROPE_DISABLED environment variable.
 
     Args:
         enabled: True to enable profiling, False to disable
     """
     global _PROFILER_ENABLED
     _PROFILER_ENABLED = enabled
+    for profiler in _PROFILER_REGISTRY.values():
+        profiler._refresh_active()
 
 
 def is_global_enabled() -> bool:
@@ -62,31 +100,72 @@ class Profiler:
         results = profiler.get_results()
     """
 
-    def __init__(self, name: str = "Profiler"):
+    def __init__(self, name: str = "Profiler", sample_rate: float = 1.0):
         """
         Initialize a new profiler instance.
 
         Args:
             name: Human-readable name for this profiler
+            sample_rate: Fraction of block entries to time, in (0, 1]. Below 1, each
+                block times one entry out of every 1/sample_rate (deterministically,
+                no random numbers) and results scale hits and totals back up.
+
+        Raises:
+            ValueError: If sample_rate is not in (0, 1]
         """
+        if not 0.0 < sample_rate <= 1.0:
+            raise ValueError(f"sample_rate must be in (0, 1], got {sample_rate}")
+
         global _NEXT_PROFILER_ID
         self._profiler_id = _NEXT_PROFILER_ID
         _NEXT_PROFILER_ID += 1
         _PROFILER_REGISTRY[self._profiler_id] = self
 
         self._name = name
-        self._tracks: dict[int, ProfileTrack] = {}
+        self._track_names: dict[int, Optional[str]] = {}  # Known tracks and their names
+        self._track_blocks: dict[int, list[int]] = {}  # track_idx -> block ids (by block_idx)
         self._track_enabled: dict[int, bool] = {}  # Per-track enable/disable
-        self._next_block_idx: dict[int, int] = {}  # Next block index per track
         self._started = True  # Profiler starts enabled by default
 
+        # Call-site cache: (track_idx, file, line, name) -> block id
+        self._block_ids: dict[tuple[int, str, int, str], int] = {}
+        # block() call sites: id(caller code) -> {(bytecode offset, track_idx, name) ->
+        # (block id, free contexts)}. The outer lookup is a single int probe and the
+        # line number (costly to compute from the offset) is only needed on a miss.
+        # _site_codes keeps the code objects alive so their ids are never reused.
+        self._block_sites: dict[int, dict[tuple[int, int, str], _BlockSite]] = {}
+        self._site_codes: list[CodeType] = []
+
+        # Per-block data, indexed by block id
+        self._block_meta: list[tuple[int, str, str, int]] = []  # (track_idx, name, file, line)
+        # 1 if the block records (profiling globally enabled, profiler started and its
+        # track enabled), else 0: the only check on the decorated-function hot path
+        self._active = bytearray()
+
+        # Sampling: per-entry credit step (credits are accumulated per thread)
+        self._sample_rate = sample_rate
+        self._sample_step = max(1, round(sample_rate * _SAMPLE_UNIT))
+
+        # Per-thread statistics: the calling thread's _ThreadData is self._local.data,
+        # and every live thread's is kept in _all_thread_data for merging. Statistics
+        # of exited threads are folded into _retired_data. The lock guards block
+        # registration and the registry, never the recording path.
+        self._lock = threading.RLock()
+        self._local = threading.local()
+        self._all_thread_data: list[_ThreadData] = []
+        self._retired_data = _ThreadData(0, 0)
+
     def start(self) -> None:
         """Start profiling (resume data collection)."""
-        self._started = True
+        with self._lock:
+            self._started = True
+            self._refresh_active()
 
     def stop(self) -> None:
         """Stop profiling (pause data collection)."""
-        self._started = False
+        with self._lock:
+            self._started = False
+            self._refresh_active()
 
     def is_started(self) -> bool:
         """Check if profiler is started."""
@@ -100,7 +179,9 @@ class Profiler:
             track_idx: Track index
             enabled: True to enable, False to disable
         """
-        self._track_enabled[track_idx] = enabled
+        with self._lock:
+            self._track_enabled[track_idx] = enabled
+            self._refresh_active()
 
     def is_track_enabled(self, track_idx: int) -> bool:
         """
@@ -114,6 +195,17 @@ class Profiler:
         """
         return self._track_enabled.get(track_idx, True)
 
+    def _is_block_active(self, track_idx: int) -> bool:
+        """Check whether blocks on a track currently record."""
+        return _PROFILER_ENABLED and self._started and self._track_enabled.get(track_idx, True)
+
+    def _refresh_active(self) -> None:
+        """Recompute the per-block active flags after a global, instance or track toggle."""
+        # Under the lock, so no block is registered with a flag computed before the toggle
+        with self._lock:
+            for block_id, meta in enumerate(self._block_meta):
+                self._active[block_id] = self._is_block_active(meta[0])
+
     def set_track_name(self, track_idx: int, name: str) -> None:
         """
         Set a human-readable name for a track.
@@ -122,15 +214,15 @@ class Profiler:
             track_idx: Track index
             name: Track name
         """
-        track = self._get_or_create_track(track_idx)
-        track.track_name = name
+        self._get_or_create_track(track_idx)
+        self._track_names[track_idx] = name
 
-    def _get_or_create_track(self, track_idx: int) -> ProfileTrack:
-        """Get or create a track by index."""
-        if track_idx not in self._tracks:
-            self._tracks[track_idx] = ProfileTrack(track_idx=track_idx)
-            self._next_block_idx[track_idx] = 0
-        return self._tracks[track_idx]
+    def _get_or_create_track(self, track_idx: int) -> list[int]:
+        """Get or create a track by index, returning its list of block ids."""
+        if track_idx not in self._track_blocks:
+            self._track_names[track_idx] = None
+            self._track_blocks[track_idx] = []
+        return self._track_blocks[track_idx]
 
     def _register_block(self, track_idx: int, name: str, file: str, line: int) -> int:
         """
@@ -145,12 +237,111 @@ class Profiler:
         Returns:
             Block index within the track
         """
-        track = self._get_or_create_track(track_idx)
-        block_idx = self._next_block_idx[track_idx]
-        self._next_block_idx[track_idx] += 1
+        with self._lock:
+            block_ids = self._get_or_create_track(track_idx)
+            block_idx = len(block_ids)
+
+            block_id = len(self._block_meta)
+            self._block_meta.append((track_idx, name, file, line))
+            self._active.append(self._is_block_active(track_idx))
+            # Grow every thread's arrays before the block id is handed out
+            for data in self._all_thread_data:
+                data.add_block()
+            self._retired_data.add_block()
+
+            block_ids.append(block_id)
+            return block_idx
+
+    def _get_block_id(self, track_idx: int, name: str, file: str, line: int) -> int:
+        """
+        Resolve a call site to its block id, registering the block on first use.
+
+        Args:
+            track_idx: Track index
+            name: Block name
+            file: Source file
+            line: Line number
+
+        Returns:
+            Block id indexing the per-block statistics arrays
+        """
+        cache_key = (track_idx, file, line, name)
+        block_id = self._block_ids.get(cache_key)
+        if block_id is None:
+            with self._lock:
+                # Another thread may have registered the call site meanwhile
+                block_id = self._block_ids.get(cache_key)
+                if block_id is None:
+                    # Store interned strings so later lookups with literal names and
+                    # code object filenames match the stored key by identity, without
+                    # comparing characters, and repeated names share one copy
+                    name = sys.intern(name)
+                    file = sys.intern(file)
+                    cache_key = (track_idx, file, line, name)
+                    block_idx = self._register_block(track_idx, name, file, line)
+                    block_id = self._track_blocks[track_idx][block_idx]
+                    self._block_ids[cache_key] = block_id
+        return block_id
+
+    def _thread_data(self) -> "_ThreadData":
+        """Return the calling thread's statistics, creating them on its first record."""
+        try:
+            data: _ThreadData = self._local.data
+            return data
+        except AttributeError:
+            pass
+        with self._lock:
+            data = _ThreadData(threading.get_ident(), len(self._block_meta))
+            self._all_thread_data.append(data)
+        self._local.data = data
+        # The token is only referenced by this thread's local storage, which is
+        # cleared when the thread exits: its finalizer then retires the data
+        token = self._local.token = _ThreadToken()
+        finalizer = weakref.finalize(token, _retire_thread_data, weakref.ref(self), data)
+        finalizer.atexit = False
+        return data
+
+    def _retire(self, data: "_ThreadData") -> None:
+        """
+        Fold the statistics of an exited thread into the retired statistics.
+
+        Args:
+            data: Statistics of the exited thread
+        """
+        with self._lock:
+            try:
+                self._all_thread_data.remove(data)
+            except ValueError:
+                return
+            self._retired_data.merge(data)
+
+    def _take_sample(self, block_id: int) -> bool:
+        """
+        Advance a block's sampling credit and report whether this entry is timed.
+
+        Args:
+            block_id: Block id
+
+        Returns:
+            True if the entry completes a credit unit and should be timed
+        """
+        credits = self._thread_data().credits
+        credit = credits[block_id] + self._sample_step
+        if credit < _SAMPLE_UNIT:
+            credits[block_id] = credit
+            return False
+        credits[block_id] = credit - _SAMPLE_UNIT
+        return True
+
+    def _record(self, block_id: int, elapsed_ns: int) -> None:
+        """
+        Record execution time for a block id.
 
-        track.add_block(block_idx, name, file, line)
-        return block_idx
+        Args:
+            block_id: Block id
+            elapsed_ns: Elapsed time in nanoseconds
+        """
+        self._thread_data().record(block_id, elapsed_ns)
 
     def _record_block_time(self, track_idx: int, block_idx: int, elapsed_ns: int) -> None:
         """
@@ -161,30 +352,112 @@ class Profiler:
             block_idx: Block index
             elapsed_ns: Elapsed time in nanoseconds
         """
-        track = self._tracks.get(track_idx)
-        if track is None:
+        block_ids = self._track_blocks.get(track_idx)
+        if block_ids is None or not 0 <= block_idx < len(block_ids):
             return
 
-        block = track.get_block(block_idx)
-        if block is not None:
-            block.record_time(elapsed_ns)
+        self._record(block_ids[block_idx], elapsed_ns)
 
     def get_results(self) -> ProfilerResults:
         """
         Get profiling results.
 
+        When sampling, hit counts and total times are scaled by 1/sample_rate to
+        estimate the full run; min and max are the observed values.
+
         Returns:
             ProfilerResults containing all tracks and blocks
         """
+        with self._lock:
+            hits, totals, mins, maxs = self._merge_thread_data()
+            track_blocks = {idx: list(block_ids) for idx, block_ids in self._track_blocks.items()}
+
+        # Scale only when sampling: unsampled counts stay exact integers, even past
+        # the 2**53 a float holds exactly
+        if self._sample_step < _SAMPLE_UNIT:
+            scale = 1.0 / self._sample_rate
+            hits = [round(value * scale) for value in hits]
+            totals = [round(value * scale) for value in totals]
+
         results = ProfilerResults(profiler_name=self._name)
-        results.tracks = self._tracks.copy()
+        for track_idx, block_ids in track_blocks.items():
+            track = ProfileTrack(
+                track_idx=track_idx,
+                track_name=self._track_names[track_idx],
+                enabled=self._track_enabled.get(track_idx, True),
+            )
+            for block_idx, block_id in enumerate(block_ids):
+                _, name, file, line = self._block_meta[block_id]
+                track.blocks[block_idx] = ProfileBlock(
+                    name=name,
+                    file=file,
+                    line=line,
+                    hit_count=hits[block_id],
+                    total_time_ns=totals[block_id],
+                    min_time_ns=mins[block_id],
+                    max_time_ns=maxs[block_id],
+                )
+            results.tracks[track_idx] = track
         return results
 
+    def get_hit_count(self, track_idx: int, block_idx: int) -> int:
+        """
+        Get the hit count of a single block without building the full results.
+
+        Sums the block's counter across threads instead of merging every block,
+        and scales it like get_results() when sampling.
+
+        Args:
+            track_idx: Track index
+            block_idx: Block index within the track, as in ProfileTrack.blocks
+
+        Returns:
+            Number of times the block was executed (0 if no such block exists)
+        """
+        with self._lock:
+            block_ids = self._track_blocks.get(track_idx)
+            if block_ids is None or not 0 <= block_idx < len(block_ids):
+                return 0
+            block_id = block_ids[block_idx]
+            hits = self._retired_data.hits[block_id]
+            hits += sum(data.hits[block_id] for data in self._all_thread_data)
+        if self._sample_step < _SAMPLE_UNIT:
+            return round(hits / self._sample_rate)
+        return hits
+
+    def _merge_thread_data(self) -> tuple[list[int], list[int], list[int], list[int]]:
+        """
+        Merge the statistics of every thread (live and retired) into per-block hits,
+        totals, mins and maxs.
+
+        Must be called with the lock held, so no block is registered meanwhile.
+
+        Returns:
+            Four lists indexed by block id
+        """
+        all_data = [self._retired_data, *self._all_thread_data]
+        # zip(*arrays) yields one tuple per block holding that block's value in each thread
+        hits = [sum(values) for values in zip(*(data.hits for data in all_data))]
+        totals = [sum(values) for values in zip(*(data.totals for data in all_data))]
+        mins = [min(values) for values in zip(*(data.mins for data in all_data))]
+        maxs = [max(values) for values in zip(*(data.maxs for data in all_data))]
+        return hits, totals, mins, maxs
+
     def clear(self) -> None:
-        """Clear all profiling data."""
-        self._tracks.clear()
-        self._track_enabled.clear()
-        self._next_block_idx.clear()
+        """
+        Clear all profiling data.
+
+        Statistics, track names and per-track enable flags are reset. Registered
+        blocks are kept, so already-decorated functions keep recording after a clear.
+        """
+        with self._lock:
+            for data in self._all_thread_data:
+                data.reset()
+            self._retired_data.reset()
+            for track_idx in self._track_names:
+                self._track_names[track_idx] = None
+            self._track_enabled.clear()
+            self._refresh_active()
 
     def track(self, track_idx: int, name: Optional[str] = None) -> Callable:
         """
@@ -215,51 +488,81 @@ class Profiler:
             # Use function name if not provided
             block_name = name if name is not None else func.__name__
 
-            # Get call-site information
-            frame = inspect.currentframe()
-            if frame and frame.f_back:
-                file = frame.f_back.f_code.co_filename
-                line = frame.f_back.f_lineno
-            else:
-                file = "<unknown>"
-                line = 0
-
-            # Check call-site cache
-            cache_key = (track_idx, file, line, block_name)
-            if cache_key in _CALL_SITE_CACHE:
-                profiler_id, block_idx = _CALL_SITE_CACHE[cache_key]
-            else:
-                # Register block and cache
-                block_idx = self._register_block(track_idx, block_name, file, line)
-                _CALL_SITE_CACHE[cache_key] = (self._profiler_id, block_idx)
-
-            # Store block_idx in function attribute for fast access
+            # Get call-site information (the frame applying the decorator), as block() does
+            frame = sys._getframe(1)
+            file = frame.f_code.co_filename
+            line = frame.f_lineno
+
+            # Resolve the call site to a block id once, at decoration time
+            block_id = self._get_block_id(track_idx, block_name, file, line)
+
+            # Bind hot-path lookups once, at decoration time
+            now = get_time_ns
+            active = self._active
+            local = self._local
+            thread_data = self._thread_data
+            sampled = self._sample_step < _SAMPLE_UNIT
+            step = self._sample_step
+
+            # The two wrappers below differ only in their call signature (forwarding
+            # *args/**kwargs costs a dict per call, so functions without parameters
+            # get a wrapper without them). The gate is inlined in both rather than
+            # shared through a helper, which would add a call to every tracked call:
+            # keep them in sync. Recording is shared through _ThreadData.record.
+            if _takes_no_arguments(func):
+
+                @functools.wraps(func)
+                def no_arg_wrapper() -> Any:
+                    # Global, track and start/stop enable, folded into one flag
+                    if not active[block_id]:
+                        return func()
+                    try:
+                        data: _ThreadData = local.data
+                    except AttributeError:
+                        data = thread_data()
+                    # Sampling: time only the entries that complete a credit unit
+                    if sampled:
+                        credit = data.credits[block_id] + step
+                        if credit < _SAMPLE_UNIT:
+                            data.credits[block_id] = credit
+                            return func()
+                        data.credits[block_id] = credit - _SAMPLE_UNIT
+
+                    start = now()
+                    try:
+                        return func()
+                    finally:
+                        data.record(block_id, now() - start)
+
+                return no_arg_wrapper
+
             @functools.wraps(func)
             def wrapper(*args: Any, **kwargs: Any) -> Any:
-                # Level 2: Per-track enable/disable (fast guard)
-                if not self.is_track_enabled(track_idx):
-                    return func(*args, **kwargs)
-
-                # Level 3: Instance start/stop
-                if not self._started:
+                # Same gate as no_arg_wrapper
+                if not active[block_id]:
                     return func(*args, **kwargs)
-
-                # Profile the function
-                start = get_time_ns()
                 try:
-                    result = func(*args, **kwargs)
-                    return result
+                    data: _ThreadData = local.data
+                except AttributeError:
+                    data = thread_data()
+                if sampled:
+                    credit = data.credits[block_id] + step
+                    if credit < _SAMPLE_UNIT:
+                        data.credits[block_id] = credit
+                        return func(*args, **kwargs)
+                    data.credits[block_id] = credit - _SAMPLE_UNIT
+
+                start = now()
+                try:
+                    return func(*args, **kwargs)
                 finally:
-                    end = get_time_ns()
-                    elapsed = end - start
-                    self._record_block_time(track_idx, block_idx, elapsed)
+                    data.record(block_id, now() - start)
 
             return wrapper
 
         return decorator
 
-    @contextmanager
-    def block(self, track_idx: int, name: str) -> Generator[None, None, None]:
+    def block(self, track_idx: int, name: str) -> AbstractContextManager[None]:
         """
         Context manager for profiling code blocks.
 
@@ -271,50 +574,62 @@ class Profiler:
             track_idx: Track index for this block
             name: Block name (required)
 
-        Yields:
-            None
+        Returns:
+            Context manager timing the enclosed code
         """
         # Level 1: Global enable/disable
-        if not _PROFILER_ENABLED:
-            yield
-            return
-
         # Level 2: Per-track enable/disable
-        if not self.is_track_enabled(track_idx):
-            yield
-            return
-
         # Level 3: Instance start/stop
-        if not self._started:
-            yield
-            return
+        if (
+            not _PROFILER_ENABLED
+            or not self._track_enabled.get(track_idx, True)
+            or not self._started
+        ):
+            return _NULL_BLOCK
+
+        # Get call-site information (the caller of block(), not a contextlib frame)
+        frame = sys._getframe(1)
+        code = frame.f_code
+
+        # Resolve the call site to its block id (registered on first use)
+        site_blocks = self._block_sites.get(id(code))
+        if site_blocks is None:
+            with self._lock:
+                site_blocks = self._block_sites.get(id(code))
+                if site_blocks is None:
+                    site_blocks = self._block_sites[id(code)] = {}
+                    self._site_codes.append(code)
+        site_key = (frame.f_lasti, track_idx, name)
+        site = site_blocks.get(site_key)
+        if site is None:
+            block_id = self._get_block_id(track_idx, name, code.co_filename, frame.f_lineno)
+            site = (block_id, [])
+            site_blocks[(frame.f_lasti, track_idx, sys.intern(name))] = site
+        block_id, free = site
+
+        # Reuse a free context of the site (list.pop is atomic). Every entry in flight
+        # holds its own context, so entries overlapping on one thread (asyncio tasks,
+        # generators) or racing on several threads get a new one, which joins the
+        # free list on exit: contexts are only allocated up to the site's concurrency.
+        try:
+            return free.pop()
+        except IndexError:
+            return self._new_block_context(block_id, free)
 
-        # Get call-site information
-        frame = inspect.currentframe()
-        if frame and frame.f_back:
-            file = frame.f_back.f_code.co_filename
-            line = frame.f_back.f_lineno
-        else:
-            file = "<unknown>"
-            line = 0
+    def _new_block_context(self, block_id: int, free: list["_BlockContext"]) -> "_BlockContext":
+        """
+        Create a context manager for a block() call site.
 
-        # Check call-site cache
-        cache_key = (track_idx, file, line, name)
-        if cache_key in _CALL_SITE_CACHE:
-            profiler_id, block_idx = _CALL_SITE_CACHE[cache_key]
-        else:
-            # Register block and cache
-            block_idx = self._register_block(track_idx, name, file, line)
-            _CALL_SITE_CACHE[cache_key] = (self._profiler_id, block_idx)
+        Args:
+            block_id: Block id of the call site
+            free: Free list of the call site, which the context rejoins on exit
 
-        # Profile the block
-        start = get_time_ns()
-        try:
-            yield
-        finally:
-            end = get_time_ns()
-            elapsed = end - start
-            self._record_block_time(track_idx, block_idx, elapsed)
+        Returns:
+            Context manager, sampling if the profiler samples
+        """
+        if self._sample_step < _SAMPLE_UNIT:
+            return _SampledBlockContext(self, block_id, free)
+        return _BlockContext(self, block_id, free)
 
     def export_csv(self, filename: str) -> None:
         """
@@ -352,11 +667,206 @@ class Profiler:
 
     def __repr__(self) -> str:
         return (
-            f"Profiler(name={self._name!r}, tracks={len(self._tracks)}, "
+            f"Profiler(name={self._name!r}, tracks={len(self._track_blocks)}, "
             f"started={self._started})"
         )
 
 
+class _BlockContext:
+    """
+    Context manager returned by Profiler.block() for an enabled block.
+
+    A plain class with __slots__ instead of a @contextmanager generator: entering
+    and exiting are two direct method calls, with no generator frame to create,
+    resume and finalize on every block.
+
+    Contexts are reused through their call site's free list: block() takes one out
+    and __exit__ puts it back. An entry in flight keeps its context, and its start
+    time, to itself, so entries of the same block that overlap on one thread
+    (asyncio tasks, generators) or exit on another thread than they entered are each
+    timed correctly. The elapsed time is recorded into the statistics of the thread
+    that exits.
+    """
+
+    __slots__ = ("_profiler", "_block_id", "_free", "_now", "_start")
+
+    def __init__(self, profiler: Profiler, block_id: int, free: list["_BlockContext"]):
+        self._profiler = profiler
+        self._block_id = block_id
+        self._free = free
+        # Clock bound once per context rather than looked up on every entry and exit
+        self._now = get_time_ns
+        self._start = _UNSAMPLED
+
+    def __enter__(self) -> None:
+        self._start = self._now()
+
+    def __exit__(
+        self,
+        exc_type: Optional[type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        end = self._now()
+        profiler = self._profiler
+        try:
+            data: _ThreadData = profiler._local.data
+        except AttributeError:
+            data = profiler._thread_data()
+        data.record(self._block_id, end - self._start)
+        self._free.append(self)
+
+
+class _SampledBlockContext(_BlockContext):
+    """Block context manager for a sampling profiler: only sampled entries are timed."""
+
+    __slots__ = ()
+
+    def __enter__(self) -> None:
+        if self._profiler._take_sample(self._block_id):
+            self._start = self._now()
+        else:
+            self._start = _UNSAMPLED
+
+    def __exit__(
+        self,
+        exc_type: Optional[type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        if self._start != _UNSAMPLED:
+            super().__exit__(exc_type, exc_value, traceback)
+        else:
+            self._free.append(self)
+
+
+# A block() call site: its block id and its free contexts
+_BlockSite = tuple[int, list[_BlockContext]]
+
+
+class _ThreadData:
+    """
+    Statistics recorded by one thread for one profiler, indexed by block id.
+
+    Only the owning thread writes to these arrays, so recording needs no lock;
+    Profiler.get_results() merges the arrays of all threads. The profiler grows
+    every thread's arrays (under its lock) when a block is registered.
+    """
+
+    __slots__ = ("thread_id", "hits", "totals", "mins", "maxs", "credits")
+
+    def __init__(self, thread_id: int, num_blocks: int):
+        self.thread_id = thread_id
+        self.hits = array("q", [0]) * num_blocks
+        self.totals = array("q", [0]) * num_blocks
+        self.mins = array("q", [_MIN_TIME_INIT]) * num_blocks
+        self.maxs = array("q", [0]) * num_blocks
+        # Sampling credit per block (see Profiler._take_sample)
+        self.credits = array("q", [0]) * num_blocks
+
+    def add_block(self) -> None:
+        """Append the initial statistics of a newly registered block."""
+        self.hits.append(0)
+        self.totals.append(0)
+        self.mins.append(_MIN_TIME_INIT)
+        self.maxs.append(0)
+        self.credits.append(0)
+
+    def record(self, block_id: int, elapsed_ns: int) -> None:
+        """
+        Record execution time for a block id.
+
+        Args:
+            block_id: Block id
+            elapsed_ns: Elapsed time in nanoseconds
+        """
+        self.hits[block_id] += 1
+        self.totals[block_id] += elapsed_ns
+        if elapsed_ns < self.mins[block_id]:
+            self.mins[block_id] = elapsed_ns
+        if elapsed_ns > self.maxs[block_id]:
+            self.maxs[block_id] = elapsed_ns
+
+    def merge(self, other: "_ThreadData") -> None:
+        """
+        Add the statistics of another thread into this one.
+
+        Args:
+            other: Statistics with the same number of blocks
+        """
+        self.hits[:] = array("q", map(operator.add, self.hits, other.hits))
+        self.totals[:] = array("q", map(operator.add, self.totals, other.totals))
+        self.mins[:] = array("q", map(min, self.mins, other.mins))
+        self.maxs[:] = array("q", map(max, self.maxs, other.maxs))
+
+    def reset(self) -> None:
+        """Reset statistics and sampling credits."""
+        num_blocks = len(self.hits)
+        self.hits[:] = array("q", [0]) * num_blocks
+        self.totals[:] = array("q", [0]) * num_blocks
+        self.mins[:] = array("q", [_MIN_TIME_INIT]) * num_blocks
+        self.maxs[:] = array("q", [0]) * num_blocks
+        self.credits[:] = array("q", [0]) * num_blocks
+
+
+class _ThreadToken:
+    """Marker kept in a thread's local storage; its finalizer runs when the thread exits."""
+
+    __slots__ = ("__weakref__",)
+
+
+def _retire_thread_data(profiler_ref: "weakref.ref[Profiler]", data: _ThreadData) -> None:
+    """
+    Finalizer of a thread's token: retire its statistics if the profiler still exists.
+
+    Args:
+        profiler_ref: Weak reference to the profiler, so finalizers do not keep it alive
+        data: Statistics of the exited thread
+    """
+    profiler = profiler_ref()
+    if profiler is not None:
+        profiler._retire(data)
+
+
+class _NullBlock:
+    """Shared no-op context manager returned by Profiler.block() when profiling is off."""
+
+    __slots__ = ()
+
+    def __enter__(self) -> None:
+        return None
+
+    def __exit__(
+        self,
+        exc_type: Optional[type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        return None
+
+
+_NULL_BLOCK = _NullBlock()
+
+
+def _takes_no_arguments(func: Callable) -> bool:
+    """
+    Check whether func is a plain Python function declared without any parameters.
+
+    Args:
+        func: Function being decorated
+
+    Returns:
+        True if func can only be called as func()
+    """
+    code = getattr(func, "__code__", None)
+    return (
+        isinstance(code, CodeType)
+        and code.co_argcount == 0
+        and code.co_kwonlyargcount == 0
+        and not code.co_flags & (_CO_VARARGS | _CO_VARKEYWORDS)
+    )
+
+
 def _get_profiler(profiler_id: int) -> Optional[Profiler]:
     """Get a profiler instance by ID from the global registry."""
     return _PROFILER_REGISTRY.get(profiler_id)
@@ -0,0 +1,151 @@
+"""
+Sampling profiler for Stichotrope.
+
+Provides SamplingProfiler, a statistical alternative to explicit instrumentation for
+low-overhead production use. Instead of timing decorated functions and blocks, it
+installs a SIGPROF handler driven by a CPU-time interval timer and, on every tick,
+counts each function found on the interrupted call stack. Results use the same
+ProfilerResults structure as Profiler, so the export functions work unchanged.
+
+Limitations:
+- Requires signal.setitimer (Unix); not available on Windows.
+- Signal handlers run in the main thread, so only the main thread is sampled, and
+  start()/stop() must be called from the main thread.
+- Times are estimates: samples x interval, counted inclusively (a function is
+  credited for every sample taken while it is anywhere on the stack).
+"""
+
+import signal
+from types import FrameType
+from typing import Any, Optional
+
+from stichotrope.types import ProfileBlock, ProfilerResults, ProfileTrack
+
+
+class SamplingProfiler:
+    """
+    Statistical profiler sampling the main thread's call stack at a fixed rate.
+
+    Example:
+        profiler = SamplingProfiler("MyApp", sampling_hz=1000)
+
+        profiler.start()
+        run_workload()
+        profiler.stop()
+
+        print_results(profiler.get_results())
+    """
+
+    def __init__(self, name: str = "SamplingProfiler", sampling_hz: float = 1000.0):
+        """
+        Initialize a new sampling profiler.
+
+        Args:
+            name: Human-readable name for this profiler
+            sampling_hz: Samples per second of process CPU time
+
+        Raises:
+            ValueError: If sampling_hz is not positive
+            RuntimeError: If the platform has no SIGPROF interval timer
+        """
+        if sampling_hz <= 0:
+            raise ValueError(f"sampling_hz must be positive, got {sampling_hz}")
+        if not hasattr(signal, "setitimer") or not hasattr(signal, "SIGPROF"):
+            raise RuntimeError("SamplingProfiler requires signal.setitimer and SIGPROF (Unix)")
+
+        self._name = name
+        self._interval_s = 1.0 / sampling_hz
+        self._interval_ns = round(self._interval_s * 1_000_000_000)
+        self._started = False
+        self._previous_handler: Any = None
+
+        # (file, first line, function name) -> number of samples with it on the stack
+        self._counts: dict[tuple[str, int, str], int] = {}
+        self._total_samples = 0
+
+    def start(self) -> None:
+        """Start sampling (must be called from the main thread)."""
+        if self._started:
+            return
+        self._previous_handler = signal.signal(signal.SIGPROF, self._sample)
+        signal.setitimer(signal.ITIMER_PROF, self._interval_s, self._interval_s)
+        self._started = True
+
+    def stop(self) -> None:
+        """Stop sampling and restore the previous SIGPROF handler."""
+        if not self._started:
+            return
+        signal.setitimer(signal.ITIMER_PROF, 0, 0)
+        signal.signal(signal.SIGPROF, self._previous_handler)
+        self._previous_handler = None
+        self._started = False
+
+    def is_started(self) -> bool:
+        """Check if the profiler is sampling."""
+        return self._started
+
+    def _sample(self, signum: int, frame: Optional[FrameType]) -> None:
+        """
+        SIGPROF handler: count every distinct function on the interrupted stack.
+
+        Args:
+            signum: Signal number
+            frame: Frame that was executing when the signal arrived
+        """
+        self._total_samples += 1
+        counts = self._counts
+        seen = set()
+        while frame is not None:
+            code = frame.f_code
+            # Count recursive functions once per sample
+            if code not in seen:
+                seen.add(code)
+                key = (code.co_filename, code.co_firstlineno, code.co_name)
+                counts[key] = counts.get(key, 0) + 1
+            frame = frame.f_back
+
+    def get_results(self) -> ProfilerResults:
+        """
+        Get sampling results.
+
+        All functions are reported on track 0, one block per function, ordered by
+        sample count. A block's hit count is its number of samples and its total
+        time is samples x sampling interval.
+
+        Returns:
+            ProfilerResults containing a single track of sampled functions
+        """
+        results = ProfilerResults(profiler_name=self._name)
+        if not self._counts:
+            return results
+
+        track = ProfileTrack(track_idx=0, track_name="Sampled")
+        ranked = sorted(self._counts.items(), key=lambda item: item[1], reverse=True)
+        for block_idx, ((file, line, name), samples) in enumerate(ranked):
+            track.blocks[block_idx] = ProfileBlock(
+                name=name,
+                file=file,
+                line=line,
+                hit_count=samples,
+                total_time_ns=samples * self._interval_ns,
+                min_time_ns=self._interval_ns,
+                max_time_ns=self._interval_ns,
+            )
+        results.tracks[0] = track
+        return results
+
+    @property
+    def total_samples(self) -> int:
+        """Number of samples taken since creation or the last clear()."""
+        return self._total_samples
+
+    def clear(self) -> None:
+        """Clear all collected samples."""
+        self._counts.clear()
+        self._total_samples = 0
+
+    def __repr__(self) -> str:
+        return (
+            f"SamplingProfiler(name={self._name!r}, interval_ns={self._interval_ns}, "
+            f"samples={self._total_samples}, started={self._started})"
+        )
@@ -18,6 +18,11 @@ Primary: time.perf_counter_ns()
 - Wall-clock time (includes I/O, sleep)
 - Platform-independent
 - Best for general-purpose profiling
+- Already a thin C wrapper over clock_gettime(CLOCK_MONOTONIC) on Linux and
+  QueryPerformanceCounter on Windows; calling those through ctypes would add
+  foreign-call overhead rather than remove it, so hot paths bind this function
+  once (when a function is decorated, or in each reused block() context) instead
+  of re-resolving it on every call
 
 Alternatives (documented for future consideration):
 
@@ -52,12 +57,18 @@ def measure_timing_overhead(iterations: int = 10000) -> float:
     Returns:
         Average overhead per timing call in nanoseconds
     """
-    start = get_time_ns()
+    # Bound locally, as the profiler's hot paths do
+    now = get_time_ns
+
+    start = now()
+    for _ in range(iterations):
+        now()
+    timed_loop = now() - start
+
+    # Same loop without the timing call, to subtract the loop's own cost
+    start = now()
     for _ in range(iterations):
-        get_time_ns()
-    end = get_time_ns()
+        pass
+    empty_loop = now() - start
 
-    total_time = end - start
-    # Subtract the two timing calls (start and end)
-    overhead_per_call = (total_time - 2 * 100) / iterations  # Approximate
-    return overhead_per_call
+    return max(timed_loop - empty_loop, 0) / iterations
@@ -4,11 +4,16 @@ Data structures for Stichotrope profiler.
 Defines ProfileBlock, ProfileTrack, and ProfilerResults for organizing profiling data.
 """
 
+import sys
 from dataclasses import dataclass, field
-from typing import Optional
+from typing import Any, Optional
 
+# Result objects are created in bulk by get_results() and read in loops by the
+# exporters; slots drop the per-instance __dict__ where dataclasses support it
+_DATACLASS_OPTIONS: dict[str, Any] = {"slots": True} if sys.version_info >= (3, 10) else {}
 
-@dataclass
+
+@dataclass(**_DATACLASS_OPTIONS)
 class ProfileBlock:
     """
     Represents a single profiled code block with accumulated timing statistics.
@@ -40,8 +45,11 @@ class ProfileBlock:
         """
         self.hit_count += 1
         self.total_time_ns += elapsed_ns
-        self.min_time_ns = min(self.min_time_ns, elapsed_ns)
-        self.max_time_ns = max(self.max_time_ns, elapsed_ns)
+        # Plain comparisons: cheaper than calling min()/max() and only store on change
+        if elapsed_ns < self.min_time_ns:
+            self.min_time_ns = elapsed_ns
+        if elapsed_ns > self.max_time_ns:
+            self.max_time_ns = elapsed_ns
 
     @property
     def avg_time_ns(self) -> float:
@@ -57,7 +65,7 @@ class ProfileBlock:
         )
 
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class ProfileTrack:
     """
     Represents a logical track containing multiple profiled blocks.
@@ -116,7 +124,7 @@ class ProfileTrack:
         )
 
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class ProfilerResults:
     """
     Complete profiling results for a profiler instance.
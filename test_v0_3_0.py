@@ -176,7 +176,7 @@ def test_csv_format_matches_cpprofiler():
     csv_str = export_csv(results)
 
     # Parse CSV
-    lines = csv_str.strip().split('\n')
+    lines = csv_str.strip().splitlines()
     header = lines[0]
 
     # Check header matches CppProfiler format
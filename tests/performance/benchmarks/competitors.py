@@ -6,12 +6,89 @@ fair comparison of overhead, features, and output quality.
 """
 
 import cProfile
+import functools
+import importlib.util
 import io
 import pstats
+import statistics
+import subprocess
+import time
 import timeit
 from abc import ABC, abstractmethod
 from typing import Any, Callable
 
+from tests.performance.statistics_utils import measurement_context
+
+# Minimum duration of one timing repeat in measure_overhead(), below the shortest
+# competitive workload (1 ms) so that those run a single call per repeat
+MIN_REPEAT_TIME_S = 0.0005
+
+
+def _autorange_number(timer: timeit.Timer) -> int:
+    """
+    Find how many calls make one timing repeat last at least MIN_REPEAT_TIME_S.
+
+    Follows timeit.Timer.autorange() (1, 2, 5, 10, 20, 50, ...) with a shorter target,
+    so millisecond workloads keep a single call per repeat.
+
+    Args:
+        timer: Timer for the statement to calibrate
+
+    Returns:
+        Number of calls per repeat
+    """
+    i = 1
+    while True:
+        for j in 1, 2, 5:
+            number = i * j
+            if timer.timeit(number) >= MIN_REPEAT_TIME_S:
+                return number
+        i *= 10
+
+
+def _percentile(data: list[float], percent: int) -> float:
+    """
+    Percentile of the data, interpolated between samples.
+
+    Args:
+        data: Measurements
+        percent: Percentile to compute, from 1 to 99
+
+    Returns:
+        The percentile (the single value if there is only one)
+    """
+    if len(data) < 2:
+        return data[0]
+    return statistics.quantiles(data, n=100, method="inclusive")[percent - 1]
+
+
+@functools.cache
+def _pyspy_available() -> bool:
+    """
+    Check once per process whether the py-spy executable can be run.
+
+    Returns:
+        True if `py-spy --version` succeeds
+    """
+    try:
+        result = subprocess.run(["py-spy", "--version"], capture_output=True, timeout=5)
+        return result.returncode == 0
+    except (FileNotFoundError, subprocess.TimeoutExpired):
+        return False
+
+
+def _module_available(name: str) -> bool:
+    """
+    Check whether a module can be imported, without importing it.
+
+    Args:
+        name: Top-level module name
+
+    Returns:
+        True if the module is installed
+    """
+    return importlib.util.find_spec(name) is not None
+
 
 class ProfilerWrapper(ABC):
     """
@@ -65,10 +142,20 @@ class ProfilerWrapper(ABC):
         """
         pass
 
+    def reset(self) -> None:
+        """Clear per-benchmark state (wrappers are shared, see get_all_profilers)."""
+        # Nothing to clear for wrappers that keep no state between profile() calls
+        return None
+
     def measure_overhead(self, func: Callable, iterations: int = 30) -> dict[str, Any]:
         """
         Measure profiler overhead.
 
+        Each repeat times the function `number` times unprofiled, then `number` times
+        profiled, with `number` scaled so that a repeat lasts at least MIN_REPEAT_TIME_S.
+        Interleaving the two keeps frequency scaling and background load from biasing
+        one side; the overhead is the median of the per-repeat paired differences.
+
         Args:
             func: Function to profile
             iterations: Number of measurements
@@ -76,31 +163,51 @@ class ProfilerWrapper(ABC):
         Returns:
             Dictionary with overhead statistics
         """
-        # Measure baseline (unprofiled)
-        baseline_times = timeit.repeat(func, repeat=iterations, number=1)
-
-        # Measure profiled
-        def profiled_func():
-            return self.profile(func)
-
-        profiled_times = timeit.repeat(profiled_func, repeat=iterations, number=1)
-
-        # Calculate overhead
-        baseline_mean = sum(baseline_times) / len(baseline_times)
-        profiled_mean = sum(profiled_times) / len(profiled_times)
-
-        overhead_ns = (profiled_mean - baseline_mean) * 1e9
-        overhead_pct = (
-            ((profiled_mean - baseline_mean) / baseline_mean * 100) if baseline_mean > 0 else 0.0
-        )
+        profile = self.profile
+        number = _autorange_number(timeit.Timer("p(f)", globals={"p": profile, "f": func}))
+        calls = range(number)
+        now = time.perf_counter_ns
+
+        # Per-call times in seconds, one (baseline, profiled) pair per repeat
+        baseline_times = []
+        profiled_times = []
+        with measurement_context():
+            for _ in range(iterations):
+                t0 = now()
+                for _ in calls:
+                    func()
+                t1 = now()
+                for _ in calls:
+                    profile(func)
+                t2 = now()
+                baseline_times.append((t1 - t0) / number / 1e9)
+                profiled_times.append((t2 - t1) / number / 1e9)
+
+        differences = [p - b for b, p in zip(baseline_times, profiled_times)]
+        baseline_median = statistics.median(baseline_times)
+        overhead = statistics.median(differences)
+
+        overhead_ns = overhead * 1e9
+        overhead_pct = (overhead / baseline_median * 100) if baseline_median > 0 else 0.0
 
         return {
             "profiler": self.name,
-            "baseline_mean_ms": baseline_mean * 1000,
-            "profiled_mean_ms": profiled_mean * 1000,
+            "baseline_mean_ms": statistics.fmean(baseline_times) * 1000,
+            "profiled_mean_ms": statistics.fmean(profiled_times) * 1000,
+            "baseline_min_ms": min(baseline_times) * 1000,
+            "profiled_min_ms": min(profiled_times) * 1000,
+            "baseline_median_ms": baseline_median * 1000,
+            "profiled_median_ms": statistics.median(profiled_times) * 1000,
+            "baseline_p90_ms": _percentile(baseline_times, 90) * 1000,
+            "profiled_p90_ms": _percentile(profiled_times, 90) * 1000,
+            "baseline_p99_ms": _percentile(baseline_times, 99) * 1000,
+            "profiled_p99_ms": _percentile(profiled_times, 99) * 1000,
             "overhead_ns": overhead_ns,
+            "overhead_mean_ns": statistics.fmean(differences) * 1e9,
+            "overhead_stdev_ns": statistics.stdev(differences) * 1e9 if iterations > 1 else 0.0,
             "overhead_pct": overhead_pct,
             "iterations": iterations,
+            "number": number,
         }
 
 
@@ -111,6 +218,13 @@ class StichotropeWrapper(ProfilerWrapper):
         super().__init__("Stichotrope")
         self.profiler = None
         self.results = None
+        # Decorated callable per profiled function, reused across profile() calls
+        self._wrapped_cache: dict[Callable, Callable] = {}
+
+        if self.available:
+            from stichotrope import Profiler
+
+            self.profiler = Profiler("CompetitiveBenchmark")
 
     def _check_availability(self) -> bool:
         """Check if Stichotrope is available."""
@@ -122,25 +236,39 @@ class StichotropeWrapper(ProfilerWrapper):
             return False
 
     def profile(self, func: Callable, *args: Any, **kwargs: Any) -> Any:
-        """Profile function with Stichotrope."""
+        """
+        Profile function with Stichotrope.
+
+        The profiler is created once and each function is decorated on first use, so
+        repeated calls (as in measure_overhead) only pay the per-hit profiling cost.
+        """
         if not self.available:
             raise RuntimeError("Stichotrope not available")
 
-        from stichotrope import Profiler
+        wrapped = self._wrapped_cache.get(func)
+        if wrapped is None:
+            wrapped = self.profiler.track(0, func.__name__)(func)
+            self._wrapped_cache[func] = wrapped
 
-        self.profiler = Profiler("CompetitiveBenchmark")
+        return wrapped(*args, **kwargs)
 
-        @self.profiler.track(0, func.__name__)
-        def wrapped():
-            return func(*args, **kwargs)
+    def reset(self) -> None:
+        """Start over with a fresh profiler and no decorated functions between benchmarks."""
+        self._wrapped_cache.clear()
+        self.results = None
+        if self.available:
+            from stichotrope import Profiler
 
-        result = wrapped()
-        self.results = self.profiler.get_results()
-        return result
+            self.profiler = Profiler("CompetitiveBenchmark")
 
     def get_results(self) -> dict[str, Any]:
         """Get Stichotrope results."""
-        if self.results is None:
+        if self.profiler is None:
+            return {}
+
+        # Snapshot on demand rather than after every profiled call
+        self.results = self.profiler.get_results()
+        if not self.results.tracks:
             return {}
 
         # Extract relevant data from results
@@ -156,33 +284,42 @@ class CProfileWrapper(ProfilerWrapper):
 
     def __init__(self):
         super().__init__("cProfile")
-        self.profiler = None
+        # One profiler for the wrapper's lifetime, accumulating until reset()
+        self.profiler = cProfile.Profile()
         self.stats = None
+        self._has_data = False
 
     def _check_availability(self) -> bool:
         """Check if cProfile is available (always true for Python 3.9+)."""
         return True
 
     def profile(self, func: Callable, *args: Any, **kwargs: Any) -> Any:
-        """Profile function with cProfile."""
-        self.profiler = cProfile.Profile()
-        self.profiler.enable()
+        """Profile function with cProfile (stats are built lazily by get_results)."""
+        profiler = self.profiler
+        profiler.enable()
         try:
             result = func(*args, **kwargs)
         finally:
-            self.profiler.disable()
-
-        # Capture stats
-        s = io.StringIO()
-        self.stats = pstats.Stats(self.profiler, stream=s)
+            profiler.disable()
 
+        self._has_data = True
         return result
 
+    def reset(self) -> None:
+        """Drop the data profiled since the last reset (outside any timed call)."""
+        self.profiler.clear()
+        self.stats = None
+        self._has_data = False
+
     def get_results(self) -> dict[str, Any]:
         """Get cProfile results."""
-        if self.stats is None:
+        if not self._has_data:
             return {}
 
+        # Capture stats of the calls profiled since the last reset
+        s = io.StringIO()
+        self.stats = pstats.Stats(self.profiler, stream=s)
+
         return {
             "profiler": self.name,
             "available": self.available,
@@ -197,14 +334,8 @@ class PySpyWrapper(ProfilerWrapper):
         super().__init__("py-spy")
 
     def _check_availability(self) -> bool:
-        """Check if py-spy is available."""
-        try:
-            import subprocess
-
-            result = subprocess.run(["py-spy", "--version"], capture_output=True, timeout=5)
-            return result.returncode == 0
-        except (FileNotFoundError, subprocess.TimeoutExpired):
-            return False
+        """Check if py-spy is available (probed once per process)."""
+        return _pyspy_available()
 
     def profile(self, func: Callable, *args: Any, **kwargs: Any) -> Any:
         """
@@ -236,25 +367,25 @@ class LineProfilerWrapper(ProfilerWrapper):
     def __init__(self):
         super().__init__("line_profiler")
         self.profiler = None
+        # Functions already registered with the (single, reused) LineProfiler
+        self._added_functions: set[Callable] = set()
+        if self.available:
+            import line_profiler
+
+            self.profiler = line_profiler.LineProfiler()
 
     def _check_availability(self) -> bool:
         """Check if line_profiler is available."""
-        try:
-            import line_profiler
-
-            return True
-        except ImportError:
-            return False
+        return _module_available("line_profiler")
 
     def profile(self, func: Callable, *args: Any, **kwargs: Any) -> Any:
         """Profile function with line_profiler."""
         if not self.available:
             raise RuntimeError("line_profiler not available")
 
-        import line_profiler
-
-        self.profiler = line_profiler.LineProfiler()
-        self.profiler.add_function(func)
+        if func not in self._added_functions:
+            self.profiler.add_function(func)
+            self._added_functions.add(func)
         self.profiler.enable()
         try:
             result = func(*args, **kwargs)
@@ -263,6 +394,14 @@ class LineProfilerWrapper(ProfilerWrapper):
 
         return result
 
+    def reset(self) -> None:
+        """Start over with a fresh profiler and no registered functions between benchmarks."""
+        self._added_functions.clear()
+        if self.available:
+            import line_profiler
+
+            self.profiler = line_profiler.LineProfiler()
+
     def get_results(self) -> dict[str, Any]:
         """Get line_profiler results."""
         return {
@@ -277,24 +416,23 @@ class PyInstrumentWrapper(ProfilerWrapper):
     def __init__(self):
         super().__init__("pyinstrument")
         self.profiler = None
+        # Profiler class, imported once here rather than on every profile() call
+        self._profiler_class: Any = None
+        if self.available:
+            import pyinstrument
+
+            self._profiler_class = pyinstrument.Profiler
 
     def _check_availability(self) -> bool:
         """Check if pyinstrument is available."""
-        try:
-            import pyinstrument
-
-            return True
-        except ImportError:
-            return False
+        return _module_available("pyinstrument")
 
     def profile(self, func: Callable, *args: Any, **kwargs: Any) -> Any:
         """Profile function with pyinstrument."""
         if not self.available:
             raise RuntimeError("pyinstrument not available")
 
-        import pyinstrument
-
-        self.profiler = pyinstrument.Profiler()
+        self.profiler = self._profiler_class()
         self.profiler.start()
         try:
             result = func(*args, **kwargs)
@@ -311,20 +449,39 @@ class PyInstrumentWrapper(ProfilerWrapper):
         }
 
 
-def get_all_profilers() -> list[ProfilerWrapper]:
+# Names of the wrappers built by _all_profilers(), in order: known without building
+# the wrappers (and running their availability probes), e.g. to parametrize tests
+PROFILER_NAMES = ("Stichotrope", "cProfile", "py-spy", "line_profiler", "pyinstrument")
+
+
+@functools.cache
+def _all_profilers() -> tuple[ProfilerWrapper, ...]:
     """
-    Get all available profiler wrappers.
+    Build every profiler wrapper once per process.
 
     Returns:
-        List of profiler wrapper instances
+        Tuple of shared profiler wrapper instances
     """
-    return [
+    return (
         StichotropeWrapper(),
         CProfileWrapper(),
         PySpyWrapper(),
         LineProfilerWrapper(),
         PyInstrumentWrapper(),
-    ]
+    )
+
+
+def get_all_profilers() -> list[ProfilerWrapper]:
+    """
+    Get all profiler wrappers.
+
+    The wrappers (and their availability probes) are created once and shared between
+    callers; call reset() on a wrapper to clear its state between benchmarks.
+
+    Returns:
+        List of profiler wrapper instances
+    """
+    return list(_all_profilers())
 
 
 def get_available_profilers() -> list[ProfilerWrapper]:
@@ -334,4 +491,4 @@ def get_available_profilers() -> list[ProfilerWrapper]:
     Returns:
         List of available profiler wrapper instances
     """
-    return [p for p in get_all_profilers() if p.available]
+    return [p for p in _all_profilers() if p.available]
@@ -4,10 +4,23 @@ Pytest configuration for performance tests.
 Provides fixtures and configuration specific to performance benchmarking.
 """
 
+import contextlib
+import json
+import os
+import tempfile
+from collections.abc import Iterator
 from pathlib import Path
+from typing import Any
 
 import pytest
 
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None  # type: ignore[assignment]
+
+from tests.performance.statistics_utils import baseline_key, calibrate_timing_overhead
+
 
 def pytest_addoption(parser):
     """Add custom command-line options for performance tests."""
@@ -43,6 +56,140 @@ def benchmark_iterations():
     return 30
 
 
+class ResultsSink:
+    """Collects JSON result files during the session and writes them all at the end."""
+
+    def __init__(self):
+        self._records: list[tuple[Path, dict[str, Any]]] = []
+        self._rows: dict[Path, list[dict[str, Any]]] = {}
+
+    def record(self, path: Path, payload: dict[str, Any]) -> None:
+        """
+        Queue a result file for writing.
+
+        Args:
+            path: Destination JSON file
+            payload: JSON-serializable result data
+        """
+        self._records.append((Path(path), payload))
+
+    def append_row(self, path: Path, row: dict[str, Any]) -> None:
+        """
+        Queue one row of a baseline file holding a list of rows.
+
+        Rows are merged into the file on flush, replacing existing rows with the
+        same (scenario, multiplier, method) and keeping all others, so a partial
+        run does not drop the baselines it did not measure.
+
+        Args:
+            path: Destination JSON file
+            row: JSON-serializable result data
+        """
+        self._rows.setdefault(Path(path), []).append(row)
+
+    def flush(self) -> None:
+        """Write every queued result file."""
+        for path, payload in self._records:
+            _write_json(path, payload)
+        for path, rows in self._rows.items():
+            # Sessions may flush the same file at once (one per pytest-xdist worker):
+            # the read-merge-write must not interleave, or rows of one are lost
+            with _file_lock(path):
+                merged = {}
+                if path.exists():
+                    merged = {baseline_key(row): row for row in json.loads(path.read_bytes())}
+                merged.update((baseline_key(row), row) for row in rows)
+                _write_json(path, list(merged.values()))
+        self._records.clear()
+        self._rows.clear()
+
+
+@contextlib.contextmanager
+def _file_lock(path: Path) -> Iterator[None]:
+    """
+    Hold an exclusive lock on a sidecar lock file of path, across processes.
+
+    The lock is taken on a separate file because path itself is replaced while
+    locked. Where fcntl is unavailable (Windows) no lock is taken.
+
+    Args:
+        path: File to lock
+    """
+    if fcntl is None:
+        yield
+        return
+    with open(path.with_name(f".{path.name}.lock"), "w") as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def _write_json(path: Path, data: Any) -> None:
+    """Write JSON atomically: to a temporary file in the same directory, then replaced."""
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w") as f:
+            json.dump(data, f, indent=2)
+        os.replace(tmp_name, path)
+    except BaseException:
+        os.unlink(tmp_name)
+        raise
+
+
+@pytest.fixture(scope="session")
+def results_sink():
+    """
+    Provide a session-wide sink for benchmark result files.
+
+    Results are kept in memory while benchmarks run and written once the session
+    ends, so file I/O stays out of the measurement phase.
+
+    Returns:
+        ResultsSink: Sink whose record(path, payload) queues a JSON file
+    """
+    sink = ResultsSink()
+    yield sink
+    sink.flush()
+
+
+@pytest.fixture(scope="session")
+def calibrated_overhead():
+    """
+    Measure once per session the cost of the wrapper frame used by profiled measurements.
+
+    The overhead tests call the workload through one extra function (which the
+    profiler decorates or which opens the profiled block); the baseline calls it
+    directly. That extra call is harness cost, not profiler cost.
+
+    Returns:
+        tuple[float, float]: (mean_ns, stdev_ns) per call
+    """
+
+    def make_wrapper(func):
+        def wrapper():
+            return func()
+
+        return wrapper
+
+    return calibrate_timing_overhead(make_wrapper)
+
+
+@pytest.fixture(scope="session")
+def baseline_cache():
+    """
+    Provide a session-wide cache of unprofiled baseline measurements.
+
+    The baseline of an overhead test depends only on its workload, not on the
+    profiling method, so tests measuring the same workload share it.
+
+    Returns:
+        dict: Workload key -> (number, baseline_times)
+    """
+    return {}
+
+
 @pytest.fixture
 def regression_threshold():
     """
@@ -5,9 +5,103 @@ Provides functions for calculating confidence intervals, detecting outliers,
 and performing statistical analysis on benchmark results.
 """
 
+import contextlib
+import functools
+import gc
 import math
+import os
 import statistics
-from typing import Any, Optional
+import time
+from collections.abc import Iterator
+from typing import Any, Callable, Optional
+
+try:
+    from scipy.stats import t as _student_t
+except ImportError:
+    _student_t = None
+
+# Two-sided 95% Student-t critical values t_{0.975, df} for df = 1..59 (n = 2..60),
+# used when scipy is not installed
+_T_975 = (
+    12.706, 4.303, 3.182, 2.776, 2.571, 2.447, 2.365, 2.306, 2.262, 2.228,
+    2.201, 2.179, 2.160, 2.145, 2.131, 2.120, 2.110, 2.101, 2.093, 2.086,
+    2.080, 2.074, 2.069, 2.064, 2.060, 2.056, 2.052, 2.048, 2.045, 2.042,
+    2.040, 2.037, 2.035, 2.032, 2.030, 2.028, 2.026, 2.024, 2.023, 2.021,
+    2.020, 2.018, 2.017, 2.015, 2.014, 2.013, 2.012, 2.011, 2.010, 2.009,
+    2.008, 2.007, 2.006, 2.005, 2.004, 2.003, 2.002, 2.002, 2.001,
+)  # fmt: skip
+
+
+@functools.lru_cache(maxsize=256)
+def _t_critical(n: int, confidence: float) -> float:
+    """
+    Two-sided Student-t critical value for a sample of size n.
+
+    Uses scipy when available. Otherwise the 95% table above covers n <= 60, and
+    other cases use the Cornish-Fisher expansion of the t quantile around the normal
+    one (within 0.1% for df >= 5, converging to z for large samples).
+
+    Args:
+        n: Sample size (at least 2)
+        confidence: Confidence level, e.g. 0.95
+
+    Returns:
+        t_{(1 + confidence) / 2, n - 1}
+    """
+    df = n - 1
+    p = 0.5 + confidence / 2
+    if _student_t is not None:
+        return float(_student_t.ppf(p, df))
+    if confidence == 0.95 and df <= len(_T_975):
+        return _T_975[df - 1]
+
+    z = statistics.NormalDist().inv_cdf(p)
+    z2 = z * z
+    return (
+        z
+        + z * (z2 + 1) / (4 * df)
+        + z * (5 * z2**2 + 16 * z2 + 3) / (96 * df**2)
+        + z * (3 * z2**3 + 19 * z2**2 + 17 * z2 - 15) / (384 * df**3)
+        + z * (79 * z2**4 + 776 * z2**3 + 1482 * z2**2 - 1920 * z2 - 945) / (92160 * df**4)
+    )
+
+
+def _mean_and_stdev(data: list[float]) -> tuple[float, float]:
+    """
+    Mean and sample standard deviation of a dataset, in two float passes.
+
+    statistics.mean/stdev compute exactly with fractions, which is far slower than
+    needed for timing samples; fmean and fsum keep float accuracy at C speed.
+
+    Args:
+        data: Non-empty list of measurements
+
+    Returns:
+        Tuple of (mean, std_dev); std_dev is 0.0 for a single measurement
+    """
+    n = len(data)
+    mean = statistics.fmean(data)
+    if n < 2:
+        return (mean, 0.0)
+    sum_sq = math.fsum([(x - mean) * (x - mean) for x in data])
+    return (mean, math.sqrt(sum_sq / (n - 1)))
+
+
+def _confidence_interval(
+    mean: float, std_dev: float, n: int, confidence: float = 0.95
+) -> tuple[float, float]:
+    """Confidence interval bounds from precomputed mean and standard deviation."""
+    margin_of_error = _t_critical(n, confidence) * (std_dev / math.sqrt(n))
+
+    return (mean - margin_of_error, mean + margin_of_error)
+
+
+def _outliers(data: list[float], mean: float, std_dev: float, threshold: float) -> list[int]:
+    """Indices of values more than threshold standard deviations from the mean."""
+    if std_dev <= 0:
+        return []
+    limit = threshold * std_dev
+    return [i for i, value in enumerate(data) if abs(value - mean) > limit]
 
 
 def calculate_confidence_interval(
@@ -16,8 +110,8 @@ def calculate_confidence_interval(
     """
     Calculate confidence interval for a dataset.
 
-    Uses t-distribution for small samples (n < 30) and normal distribution
-    for larger samples.
+    Uses the exact Student-t critical value for the sample size (which tends to
+    the normal one for large samples).
 
     Args:
         data: List of measurements
@@ -29,21 +123,8 @@ def calculate_confidence_interval(
     if len(data) < 2:
         return (0.0, 0.0)
 
-    mean = statistics.mean(data)
-    std_dev = statistics.stdev(data)
-    n = len(data)
-
-    # For small samples, use t-distribution approximation
-    # For n < 30, use conservative t-value of 2.0 (roughly t_0.975 for df=20)
-    # For n >= 30, use z-value of 1.96 for 95% CI
-    if n < 30:
-        t_value = 2.0  # Conservative estimate
-    else:
-        t_value = 1.96  # z-value for 95% CI
-
-    margin_of_error = t_value * (std_dev / math.sqrt(n))
-
-    return (mean - margin_of_error, mean + margin_of_error)
+    mean, std_dev = _mean_and_stdev(data)
+    return _confidence_interval(mean, std_dev, len(data), confidence)
 
 
 def detect_outliers(data: list[float], threshold: float = 2.0) -> list[int]:
@@ -60,16 +141,8 @@ def detect_outliers(data: list[float], threshold: float = 2.0) -> list[int]:
     if len(data) < 3:
         return []
 
-    mean = statistics.mean(data)
-    std_dev = statistics.stdev(data)
-
-    outliers = []
-    for i, value in enumerate(data):
-        z_score = abs((value - mean) / std_dev) if std_dev > 0 else 0
-        if z_score > threshold:
-            outliers.append(i)
-
-    return outliers
+    mean, std_dev = _mean_and_stdev(data)
+    return _outliers(data, mean, std_dev, threshold)
 
 
 def calculate_statistics(data: list[float]) -> dict[str, Any]:
@@ -95,24 +168,130 @@ def calculate_statistics(data: list[float]) -> dict[str, Any]:
             "outliers": [],
         }
 
-    ci_lower, ci_upper = calculate_confidence_interval(data)
-    outliers = detect_outliers(data)
+    # Mean and standard deviation are computed once and shared by the CI and outliers
+    n = len(data)
+    mean, std_dev = _mean_and_stdev(data)
+    ci_lower, ci_upper = _confidence_interval(mean, std_dev, n) if n >= 2 else (0.0, 0.0)
+    outliers = _outliers(data, mean, std_dev, 2.0) if n >= 3 else []
+
+    # One sort gives the median and both extremes
+    ordered = sorted(data)
+    half = n // 2
+    median = ordered[half] if n % 2 else (ordered[half - 1] + ordered[half]) / 2
 
     return {
-        "count": len(data),
-        "mean": statistics.mean(data),
-        "median": statistics.median(data),
-        "std_dev": statistics.stdev(data) if len(data) > 1 else 0.0,
-        "min": min(data),
-        "max": max(data),
+        "count": n,
+        "mean": mean,
+        "median": median,
+        "std_dev": std_dev,
+        "min": ordered[0],
+        "max": ordered[-1],
         "ci_lower": ci_lower,
         "ci_upper": ci_upper,
         "outliers": outliers,
     }
 
 
+def _default_bench_cpu(allowed: set[int]) -> int:
+    """
+    CPU to pin the current benchmark process to when BENCH_CPU is not set.
+
+    Args:
+        allowed: CPUs the process may run on
+
+    Returns:
+        The n-th allowed CPU for pytest-xdist worker gw<n> (wrapping around), or the
+        first allowed CPU outside xdist
+    """
+    cpus = sorted(allowed)
+    worker = os.environ.get("PYTEST_XDIST_WORKER", "gw0")
+    index = int(worker[2:]) if worker[2:].isdigit() else 0
+    return cpus[index % len(cpus)]
+
+
+@contextlib.contextmanager
+def measurement_context() -> Iterator[None]:
+    """
+    Quiet the process for the duration of a timing loop.
+
+    Collects garbage once up front and disables the cyclic collector so it cannot fire
+    mid-sample, and, where os.sched_setaffinity exists (Linux), pins the process to a
+    single CPU so it is not migrated between cores. The CPU is read from the BENCH_CPU
+    environment variable; by default each pytest-xdist worker gets its own CPU among
+    the ones the process may run on, so parallel benchmarks do not share a core.
+    Both settings are restored on exit.
+
+    Yields:
+        None
+    """
+    gc_was_enabled = gc.isenabled()
+    gc.collect()
+    gc.disable()
+
+    previous_affinity = None
+    if hasattr(os, "sched_setaffinity"):
+        allowed = os.sched_getaffinity(0)
+        cpu = int(os.environ.get("BENCH_CPU", _default_bench_cpu(allowed)))
+        try:
+            os.sched_setaffinity(0, {cpu})
+            previous_affinity = allowed
+        except OSError:
+            # CPU not available to this process (containers, cgroups): run unpinned
+            pass
+
+    try:
+        yield
+    finally:
+        if previous_affinity is not None:
+            os.sched_setaffinity(0, previous_affinity)
+        if gc_was_enabled:
+            gc.enable()
+
+
+def calibrate_timing_overhead(
+    make_wrapper: Callable[[Callable], Callable], iterations: int = 100_000, batches: int = 10
+) -> tuple[float, float]:
+    """
+    Measure the per-call cost a measurement harness adds around a workload.
+
+    Times a no-op called directly and through make_wrapper(no-op), interleaved in
+    batches, and returns the per-call difference. Use it for harness layers that are
+    not part of the profiler (e.g. the extra function frame wrapping the workload in
+    the profiled measurement), so that only the profiler's own cost is reported.
+
+    Args:
+        make_wrapper: Builds the harness layer around a function
+        iterations: Total number of calls of each variant
+        batches: Number of interleaved batches the calls are split into
+
+    Returns:
+        Tuple of (mean_ns, stdev_ns) of the per-call cost over the batches
+    """
+
+    def noop() -> None:
+        pass
+
+    wrapped = make_wrapper(noop)
+    now = time.perf_counter_ns
+    calls = range(max(1, iterations // batches))
+    number = len(calls)
+
+    differences = []
+    for _ in range(batches):
+        t0 = now()
+        for _ in calls:
+            noop()
+        t1 = now()
+        for _ in calls:
+            wrapped()
+        t2 = now()
+        differences.append(((t2 - t1) - (t1 - t0)) / number)
+
+    return _mean_and_stdev(differences)
+
+
 def calculate_overhead_statistics(
-    baseline_times: list[float], profiled_times: list[float]
+    baseline_times: list[float], profiled_times: list[float], calibration_ns: float = 0.0
 ) -> dict[str, Any]:
     """
     Calculate overhead statistics comparing profiled vs baseline execution.
@@ -120,6 +299,8 @@ def calculate_overhead_statistics(
     Args:
         baseline_times: List of baseline execution times (seconds)
         profiled_times: List of profiled execution times (seconds)
+        calibration_ns: Per-call harness cost to subtract from the absolute overhead
+            (see calibrate_timing_overhead)
 
     Returns:
         Dictionary containing overhead statistics
@@ -131,15 +312,16 @@ def calculate_overhead_statistics(
     baseline_mean = baseline_stats["mean"]
     profiled_mean = profiled_stats["mean"]
 
-    overhead_ns = (profiled_mean - baseline_mean) * 1e9
-    overhead_pct = (
-        ((profiled_mean - baseline_mean) / baseline_mean * 100) if baseline_mean > 0 else 0.0
+    overhead_ns = (profiled_mean - baseline_mean) * 1e9 - calibration_ns
+    overhead_pct = (overhead_ns / 1e9 / baseline_mean * 100) if baseline_mean > 0 else 0.0
+    slowdown_factor = (
+        ((baseline_mean + overhead_ns / 1e9) / baseline_mean) if baseline_mean > 0 else 1.0
     )
-    slowdown_factor = (profiled_mean / baseline_mean) if baseline_mean > 0 else 1.0
 
     return {
         "baseline": baseline_stats,
         "profiled": profiled_stats,
+        "calibration_ns": calibration_ns,
         "overhead_ns": overhead_ns,
         "overhead_pct": overhead_pct,
         "slowdown_factor": slowdown_factor,
@@ -212,8 +394,20 @@ def format_overhead_report(overhead_stats: dict[str, Any], workload_name: str =
     return "\n".join(lines)
 
 
+# Single file holding every overhead baseline, one row per (scenario, multiplier, method)
+OVERHEAD_BASELINE_FILE = "overhead_baselines.json"
+
+
+def baseline_key(row: dict[str, Any]) -> tuple[str, int, str]:
+    """Key identifying an overhead baseline row: (scenario, multiplier, method)."""
+    return row["scenario"], row["multiplier"], row["method"]
+
+
 def check_regression(
-    current_overhead_pct: float, baseline_overhead_pct: Optional[float], threshold_pct: float = 1.0
+    current_overhead_pct: float,
+    baseline_overhead_pct: Optional[float],
+    threshold_pct: float = 1.0,
+    ok_message: bool = True,
 ) -> tuple[bool, str]:
     """
     Check if current overhead represents a regression from baseline.
@@ -222,9 +416,12 @@ def check_regression(
         current_overhead_pct: Current overhead percentage
         baseline_overhead_pct: Baseline overhead percentage (None if no baseline)
         threshold_pct: Regression threshold in percentage points (default: 1.0)
+        ok_message: Whether to format the message when there is no regression; pass
+            False when checking many baselines and only reporting regressions
 
     Returns:
-        Tuple of (is_regression, message)
+        Tuple of (is_regression, message); message is empty for a non-regression
+        when ok_message is False
     """
     if baseline_overhead_pct is None:
         return (False, "No baseline available for comparison")
@@ -236,5 +433,6 @@ def check_regression(
             True,
             f"REGRESSION: Overhead increased by {delta:.2f}% (threshold: {threshold_pct}%)",
         )
-    else:
-        return (False, f"OK: Overhead change {delta:+.2f}% (threshold: {threshold_pct}%)")
+    if not ok_message:
+        return (False, "")
+    return (False, f"OK: Overhead change {delta:+.2f}% (threshold: {threshold_pct}%)")
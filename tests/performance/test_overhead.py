@@ -5,48 +5,31 @@ Tests profiler overhead with x1, x10, x100 workload multipliers and statistical
 Establishes baseline measurements with 95% confidence intervals.
 """
 
-import json
-import timeit
+import time
+from array import array
 from pathlib import Path
 
 import pytest
 
 from tests.performance.statistics_utils import (
+    OVERHEAD_BASELINE_FILE,
     calculate_overhead_statistics,
     format_overhead_report,
+    measurement_context,
 )
 from tests.performance.workloads import (
-    create_workload_variants,
     get_all_scenarios,
     get_workload_scenario,
     simulate_work,
 )
 
-# Try to import profiler from current implementation or skip tests
+# Skip the tests when the profiler implementation is not importable
 try:
-    # First try current implementation
     from stichotrope import Profiler
 
     PROFILER_AVAILABLE = True
 except (ImportError, AttributeError):
-    # If not available, try to import from prototype branch
-    # This allows us to establish baseline even before v1.0.0 implementation
-    import subprocess
-
-    # Check if we can access prototype branch
-    try:
-        # Get prototype branch profiler code
-        result = subprocess.run(
-            ["git", "show", "prototype:stichotrope/profiler.py"],
-            capture_output=True,
-            text=True,
-            check=True,
-        )
-        # Note: In real scenario, we'd need to properly import from prototype
-        # For now, mark as unavailable and skip tests
-        PROFILER_AVAILABLE = False
-    except Exception:
-        PROFILER_AVAILABLE = False
+    PROFILER_AVAILABLE = False
 
 
 pytestmark = pytest.mark.skipif(
@@ -55,6 +38,90 @@ pytestmark = pytest.mark.skipif(
 )
 
 
+# Minimum duration of one timed batch of calls
+TARGET_BATCH_TIME_S = 0.01
+
+
+def _auto_number(func, target_s: float = TARGET_BATCH_TIME_S) -> int:
+    """
+    Find how many calls of func make a timed batch last at least target_s.
+
+    Follows the 1, 2, 5, 10, 20, 50, ... sequence of timeit's autorange.
+
+    Args:
+        func: Function to call
+        target_s: Minimum batch duration in seconds
+
+    Returns:
+        Number of calls per batch
+    """
+    now = time.perf_counter_ns
+    target_ns = target_s * 1e9
+    i = 1
+    while True:
+        for j in 1, 2, 5:
+            number = i * j
+            start = now()
+            for _ in range(number):
+                func()
+            if now() - start >= target_ns:
+                return number
+        i *= 10
+
+
+def _make_workload(duration_ms: float, multiplier: int):
+    """
+    Build a workload running simulate_work(duration_ms) multiplier times.
+
+    A single closure calling simulate_work directly, so the baseline pays one
+    harness frame instead of a lambda plus a WorkloadMultiplier call.
+
+    Args:
+        duration_ms: Duration of each simulated unit of work
+        multiplier: Number of units per workload call
+
+    Returns:
+        Function taking no arguments
+    """
+    work = simulate_work
+    repeats = range(multiplier)
+
+    def run():
+        for _ in repeats:
+            work(duration_ms)
+
+    return run
+
+
+def _time_calls(func, iterations: int, number: int = 1) -> list[float]:
+    """
+    Time batches of calls of func with the integer nanosecond clock.
+
+    Runs inside measurement_context(), with the garbage collector off and the process
+    pinned to one CPU.
+
+    Args:
+        func: Function to call
+        iterations: Number of timed batches
+        number: Calls per batch; two clock reads are amortized over the batch
+
+    Returns:
+        List of per-call execution times in seconds, one per batch
+    """
+    now = time.perf_counter_ns
+    calls = range(number)
+    # Pre-sized int64 buffer: no list growth or retained objects between samples
+    elapsed_ns = array("q", bytes(8 * iterations))
+    with measurement_context():
+        for i in range(iterations):
+            start = now()
+            for _ in calls:
+                func()
+            elapsed_ns[i] = now() - start
+    # Integer differences until here; convert once for the statistics helpers
+    return [ns / number / 1e9 for ns in elapsed_ns]
+
+
 class TestOverheadMeasurement:
     """Test profiler overhead with statistical rigor."""
 
@@ -74,22 +141,49 @@ class TestOverheadMeasurement:
             baseline_dir.mkdir(exist_ok=True)
         return baseline_dir
 
-    def measure_baseline(self, workload_func, iterations: int = 30) -> list[float]:
+    def measure_baseline(self, workload_func, iterations: int = 30, number: int = 1) -> list[float]:
         """
         Measure baseline execution time without profiling.
 
         Args:
             workload_func: Function to measure
             iterations: Number of measurements
+            number: Calls per measurement (see _auto_number)
 
         Returns:
             List of execution times in seconds
         """
-        times = timeit.repeat(workload_func, repeat=iterations, number=1)
-        return times
+        return _time_calls(workload_func, iterations, number)
+
+    def cached_baseline(
+        self, baseline_cache, key, workload_func, iterations: int = 30
+    ) -> tuple[int, list[float]]:
+        """
+        Measure the baseline of a workload once per session.
+
+        Args:
+            baseline_cache: Session cache from the baseline_cache fixture
+            key: Identifies the workload, e.g. (scenario, multiplier)
+            workload_func: Function to measure
+            iterations: Number of measurements
+
+        Returns:
+            Tuple of (calls per measurement, execution times in seconds)
+        """
+        cached = baseline_cache.get(key)
+        if cached is None:
+            number = _auto_number(workload_func)
+            cached = (number, self.measure_baseline(workload_func, iterations, number))
+            baseline_cache[key] = cached
+        return cached
 
     def measure_profiled_decorator(
-        self, workload_func, track_idx: int, block_name: str, iterations: int = 30
+        self,
+        workload_func,
+        track_idx: int,
+        block_name: str,
+        iterations: int = 30,
+        number: int = 1,
     ) -> list[float]:
         """
         Measure execution time with profiler decorator.
@@ -99,6 +193,7 @@ class TestOverheadMeasurement:
             track_idx: Track index for profiling
             block_name: Block name
             iterations: Number of measurements
+            number: Calls per measurement (see _auto_number)
 
         Returns:
             List of execution times in seconds
@@ -109,11 +204,15 @@ class TestOverheadMeasurement:
         def profiled_workload():
             return workload_func()
 
-        times = timeit.repeat(profiled_workload, repeat=iterations, number=1)
-        return times
+        return _time_calls(profiled_workload, iterations, number)
 
     def measure_profiled_context_manager(
-        self, workload_func, track_idx: int, block_name: str, iterations: int = 30
+        self,
+        workload_func,
+        track_idx: int,
+        block_name: str,
+        iterations: int = 30,
+        number: int = 1,
     ) -> list[float]:
         """
         Measure execution time with profiler context manager.
@@ -123,6 +222,7 @@ class TestOverheadMeasurement:
             track_idx: Track index for profiling
             block_name: Block name
             iterations: Number of measurements
+            number: Calls per measurement (see _auto_number)
 
         Returns:
             List of execution times in seconds
@@ -133,12 +233,13 @@ class TestOverheadMeasurement:
             with profiler.block(track_idx, block_name):
                 return workload_func()
 
-        times = timeit.repeat(profiled_workload, repeat=iterations, number=1)
-        return times
+        return _time_calls(profiled_workload, iterations, number)
 
     @pytest.mark.parametrize("scenario", get_all_scenarios())
     @pytest.mark.parametrize("multiplier", [1, 10, 100])
-    def test_overhead_decorator(self, scenario, multiplier, baseline_dir):
+    def test_overhead_decorator(
+        self, scenario, multiplier, baseline_dir, baseline_cache, calibrated_overhead, results_sink
+    ):
         """
         Test profiler overhead using decorator with workload multipliers.
 
@@ -146,58 +247,58 @@ class TestOverheadMeasurement:
         measurement noise and provide more reliable statistics.
         """
         scenario_config = get_workload_scenario(scenario)
-        duration_ms = scenario_config["duration_ms"]
+        duration_ms = scenario_config.duration_ms
 
         # Create workload with multiplier
-        def base_workload():
-            return simulate_work(duration_ms)
-
-        variants = create_workload_variants(base_workload, [multiplier])
-        workload = variants[f"x{multiplier}"]
+        workload = _make_workload(duration_ms, multiplier)
 
-        # Measure baseline and profiled execution
+        # Measure baseline (shared with the other method) and profiled execution
         iterations = 30
-        baseline_times = self.measure_baseline(workload, iterations)
+        number, baseline_times = self.cached_baseline(
+            baseline_cache, (scenario, multiplier), workload, iterations
+        )
         profiled_times = self.measure_profiled_decorator(
-            workload, 0, f"{scenario}_x{multiplier}", iterations
+            workload, 0, f"{scenario}_x{multiplier}", iterations, number
         )
 
         # Calculate statistics
-        stats = calculate_overhead_statistics(baseline_times, profiled_times)
+        # The profiled side calls the workload through one extra function frame
+        stats = calculate_overhead_statistics(
+            baseline_times, profiled_times, calibration_ns=calibrated_overhead[0]
+        )
 
         # Print report
         report = format_overhead_report(
-            stats, f"{scenario_config['name']} - Decorator - x{multiplier}"
+            stats, f"{scenario_config.name} - Decorator - x{multiplier}"
         )
         print(report)
 
         # Store results for regression tracking
-        result_file = baseline_dir / f"overhead_decorator_{scenario}_x{multiplier}.json"
-        with open(result_file, "w") as f:
-            json.dump(
-                {
-                    "scenario": scenario,
-                    "multiplier": multiplier,
-                    "method": "decorator",
-                    "statistics": {
-                        "overhead_ns": stats["overhead_ns"],
-                        "overhead_pct": stats["overhead_pct"],
-                        "slowdown_factor": stats["slowdown_factor"],
-                        "baseline_mean_ms": stats["baseline"]["mean"] * 1000,
-                        "profiled_mean_ms": stats["profiled"]["mean"] * 1000,
-                        "baseline_ci": [
-                            stats["baseline"]["ci_lower"] * 1000,
-                            stats["baseline"]["ci_upper"] * 1000,
-                        ],
-                        "profiled_ci": [
-                            stats["profiled"]["ci_lower"] * 1000,
-                            stats["profiled"]["ci_upper"] * 1000,
-                        ],
-                    },
+        results_sink.append_row(
+            baseline_dir / OVERHEAD_BASELINE_FILE,
+            {
+                "scenario": scenario,
+                "multiplier": multiplier,
+                "number": number,
+                "method": "decorator",
+                "statistics": {
+                    "overhead_ns": stats["overhead_ns"],
+                    "calibration_ns": stats["calibration_ns"],
+                    "overhead_pct": stats["overhead_pct"],
+                    "slowdown_factor": stats["slowdown_factor"],
+                    "baseline_mean_ms": stats["baseline"]["mean"] * 1000,
+                    "profiled_mean_ms": stats["profiled"]["mean"] * 1000,
+                    "baseline_ci": [
+                        stats["baseline"]["ci_lower"] * 1000,
+                        stats["baseline"]["ci_upper"] * 1000,
+                    ],
+                    "profiled_ci": [
+                        stats["profiled"]["ci_lower"] * 1000,
+                        stats["profiled"]["ci_upper"] * 1000,
+                    ],
                 },
-                f,
-                indent=2,
-            )
+            },
+        )
 
         # Success criterion: ≤10% overhead for ≥1ms blocks
         # Note: We don't fail the test, just report the measurement
@@ -212,63 +313,65 @@ class TestOverheadMeasurement:
 
     @pytest.mark.parametrize("scenario", get_all_scenarios())
     @pytest.mark.parametrize("multiplier", [1, 10, 100])
-    def test_overhead_context_manager(self, scenario, multiplier, baseline_dir):
+    def test_overhead_context_manager(
+        self, scenario, multiplier, baseline_dir, baseline_cache, calibrated_overhead, results_sink
+    ):
         """
         Test profiler overhead using context manager with workload multipliers.
         """
         scenario_config = get_workload_scenario(scenario)
-        duration_ms = scenario_config["duration_ms"]
+        duration_ms = scenario_config.duration_ms
 
         # Create workload with multiplier
-        def base_workload():
-            return simulate_work(duration_ms)
+        workload = _make_workload(duration_ms, multiplier)
 
-        variants = create_workload_variants(base_workload, [multiplier])
-        workload = variants[f"x{multiplier}"]
-
-        # Measure baseline and profiled execution
+        # Measure baseline (shared with the other method) and profiled execution
         iterations = 30
-        baseline_times = self.measure_baseline(workload, iterations)
+        number, baseline_times = self.cached_baseline(
+            baseline_cache, (scenario, multiplier), workload, iterations
+        )
         profiled_times = self.measure_profiled_context_manager(
-            workload, 0, f"{scenario}_x{multiplier}", iterations
+            workload, 0, f"{scenario}_x{multiplier}", iterations, number
         )
 
         # Calculate statistics
-        stats = calculate_overhead_statistics(baseline_times, profiled_times)
+        # The profiled side calls the workload through one extra function frame
+        stats = calculate_overhead_statistics(
+            baseline_times, profiled_times, calibration_ns=calibrated_overhead[0]
+        )
 
         # Print report
         report = format_overhead_report(
-            stats, f"{scenario_config['name']} - Context Manager - x{multiplier}"
+            stats, f"{scenario_config.name} - Context Manager - x{multiplier}"
         )
         print(report)
 
         # Store results
-        result_file = baseline_dir / f"overhead_context_{scenario}_x{multiplier}.json"
-        with open(result_file, "w") as f:
-            json.dump(
-                {
-                    "scenario": scenario,
-                    "multiplier": multiplier,
-                    "method": "context_manager",
-                    "statistics": {
-                        "overhead_ns": stats["overhead_ns"],
-                        "overhead_pct": stats["overhead_pct"],
-                        "slowdown_factor": stats["slowdown_factor"],
-                        "baseline_mean_ms": stats["baseline"]["mean"] * 1000,
-                        "profiled_mean_ms": stats["profiled"]["mean"] * 1000,
-                        "baseline_ci": [
-                            stats["baseline"]["ci_lower"] * 1000,
-                            stats["baseline"]["ci_upper"] * 1000,
-                        ],
-                        "profiled_ci": [
-                            stats["profiled"]["ci_lower"] * 1000,
-                            stats["profiled"]["ci_upper"] * 1000,
-                        ],
-                    },
+        results_sink.append_row(
+            baseline_dir / OVERHEAD_BASELINE_FILE,
+            {
+                "scenario": scenario,
+                "multiplier": multiplier,
+                "number": number,
+                "method": "context_manager",
+                "statistics": {
+                    "overhead_ns": stats["overhead_ns"],
+                    "calibration_ns": stats["calibration_ns"],
+                    "overhead_pct": stats["overhead_pct"],
+                    "slowdown_factor": stats["slowdown_factor"],
+                    "baseline_mean_ms": stats["baseline"]["mean"] * 1000,
+                    "profiled_mean_ms": stats["profiled"]["mean"] * 1000,
+                    "baseline_ci": [
+                        stats["baseline"]["ci_lower"] * 1000,
+                        stats["baseline"]["ci_upper"] * 1000,
+                    ],
+                    "profiled_ci": [
+                        stats["profiled"]["ci_lower"] * 1000,
+                        stats["profiled"]["ci_upper"] * 1000,
+                    ],
                 },
-                f,
-                indent=2,
-            )
+            },
+        )
 
         # Success criterion check
         if duration_ms >= 1.0:
@@ -6,17 +6,58 @@ across different scenarios and workload multipliers.
 """
 
 import time
+from dataclasses import dataclass
+from types import MappingProxyType
 from typing import Any, Callable
 
 
+def _spin(iterations: int) -> None:
+    """Busy loop of pure-Python bytecode, with no calls and no clock reads."""
+    for _ in range(iterations):
+        pass
+
+
+def _spin_iterations_per_ms(iterations: int = 200_000, repeats: int = 5) -> float:
+    """
+    Calibrate how many _spin iterations run in one millisecond.
+
+    Args:
+        iterations: Iterations per calibration run
+        repeats: Number of runs; the fastest one is kept
+
+    Returns:
+        Iterations per millisecond
+    """
+    now = time.perf_counter_ns
+
+    def run() -> int:
+        start = now()
+        _spin(iterations)
+        return now() - start
+
+    fastest = min(run() for _ in range(repeats))
+    return iterations * 1_000_000 / max(fastest, 1)
+
+
+# Calibrated once at import, so every simulate_work call runs a fixed amount of work
+_SPIN_ITERATIONS_PER_MS = _spin_iterations_per_ms()
+
+
 def simulate_work(duration_ms: float) -> None:
     """
-    Simulate work by sleeping for specified duration.
+    Simulate work lasting about the specified duration.
+
+    Runs a fixed, pre-calibrated number of loop iterations rather than waiting
+    for a deadline: a deadline would absorb the profiler's own cost (profilers
+    hooking the clock calls would look as fast as the baseline), whereas a
+    fixed amount of work leaves every instrumentation cost visible. Sleeping
+    is avoided too, as the scheduler's wake-up jitter (tens of microseconds)
+    is a large fraction of a short block.
 
     Args:
         duration_ms: Duration in milliseconds
     """
-    time.sleep(duration_ms / 1000.0)
+    _spin(round(duration_ms * _SPIN_ITERATIONS_PER_MS))
 
 
 def cpu_intensive_work(iterations: int = 1000) -> int:
@@ -36,7 +77,31 @@ def cpu_intensive_work(iterations: int = 1000) -> int:
     return result
 
 
+def _leaf(i: int, x: int) -> int:
+    """Minimal function body: the workload below measures the call itself."""
+    return i + x
+
+
 def nested_function_calls(depth: int = 5) -> int:
+    """
+    Simulate function call overhead with depth calls of a tiny function.
+
+    Calls are made from a loop rather than by recursion, so the cost grows linearly
+    with depth and does not depend on the interpreter's recursion limit.
+
+    Args:
+        depth: Number of calls
+
+    Returns:
+        Result of computation (same as nested_function_calls_recursive)
+    """
+    x = 1
+    for i in range(1, depth + 1):
+        x = _leaf(i, x)
+    return x
+
+
+def nested_function_calls_recursive(depth: int = 5) -> int:
     """
     Simulate nested function calls.
 
@@ -48,7 +113,7 @@ def nested_function_calls(depth: int = 5) -> int:
     """
     if depth <= 0:
         return 1
-    return depth + nested_function_calls(depth - 1)
+    return depth + nested_function_calls_recursive(depth - 1)
 
 
 def mixed_workload(duration_ms: float = 1.0, cpu_iterations: int = 100) -> tuple[None, int]:
@@ -84,6 +149,8 @@ class WorkloadMultiplier:
         """
         self.workload_func = workload_func
         self.multiplier = multiplier
+        # Bound once so that a call only loops and calls the workload
+        self._repeats = range(multiplier)
 
     def __call__(self, *args: Any, **kwargs: Any) -> Any:
         """
@@ -92,9 +159,10 @@ class WorkloadMultiplier:
         Returns:
             Result of last execution
         """
+        func = self.workload_func
         result = None
-        for _ in range(self.multiplier):
-            result = self.workload_func(*args, **kwargs)
+        for _ in self._repeats:
+            result = func(*args, **kwargs)
         return result
 
 
@@ -120,32 +188,54 @@ def create_workload_variants(
     return variants
 
 
+@dataclass(frozen=True)
+class Scenario:
+    """
+    A predefined workload scenario.
+
+    Attributes:
+        name: Human-readable name
+        duration_ms: Duration of one unit of simulated work in milliseconds
+        description: What the scenario is expected to show
+    """
+
+    name: str
+    duration_ms: float
+    description: str
+
+    def as_dict(self) -> dict[str, Any]:
+        """Scenario fields as a dictionary, e.g. for JSON serialization."""
+        return {"name": self.name, "duration_ms": self.duration_ms, "description": self.description}
+
+
 # Pre-defined workload scenarios
-WORKLOAD_SCENARIOS = {
-    "tiny": {
-        "name": "Tiny blocks (0.1ms)",
-        "duration_ms": 0.1,
-        "description": "Very short blocks, high overhead expected",
-    },
-    "small": {
-        "name": "Small blocks (1ms)",
-        "duration_ms": 1.0,
-        "description": "Small blocks, target ≤10% overhead",
-    },
-    "medium": {
-        "name": "Medium blocks (10ms)",
-        "duration_ms": 10.0,
-        "description": "Medium blocks, low overhead expected",
-    },
-    "large": {
-        "name": "Large blocks (100ms)",
-        "duration_ms": 100.0,
-        "description": "Large blocks, minimal overhead expected",
-    },
-}
-
-
-def get_workload_scenario(scenario_name: str) -> dict:
+WORKLOAD_SCENARIOS = MappingProxyType(
+    {
+        "tiny": Scenario(
+            name="Tiny blocks (0.1ms)",
+            duration_ms=0.1,
+            description="Very short blocks, high overhead expected",
+        ),
+        "small": Scenario(
+            name="Small blocks (1ms)",
+            duration_ms=1.0,
+            description="Small blocks, target ≤10% overhead",
+        ),
+        "medium": Scenario(
+            name="Medium blocks (10ms)",
+            duration_ms=10.0,
+            description="Medium blocks, low overhead expected",
+        ),
+        "large": Scenario(
+            name="Large blocks (100ms)",
+            duration_ms=100.0,
+            description="Large blocks, minimal overhead expected",
+        ),
+    }
+)
+
+
+def get_workload_scenario(scenario_name: str) -> Scenario:
     """
     Get workload scenario configuration.
 
@@ -153,7 +243,7 @@ def get_workload_scenario(scenario_name: str) -> dict:
         scenario_name: Name of scenario (tiny, small, medium, large)
 
     Returns:
-        Scenario configuration dictionary
+        Scenario configuration
 
     Raises:
         KeyError: If scenario name not found
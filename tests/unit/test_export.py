@@ -0,0 +1,37 @@
+"""
+Unit tests for the export utilities.
+"""
+
+from io import StringIO
+
+from stichotrope import Profiler, export_csv, export_json
+
+
+def _sample_results():
+    profiler = Profiler("ExportTest")
+    profiler.set_track_name(0, "Main")
+    for name in ("first", "second"):
+        block_idx = profiler._register_block(0, name, "test.py", 1)
+        profiler._record_block_time(0, block_idx, 1_000)
+    return profiler.get_results()
+
+
+class TestExport:
+    """Test CSV and JSON export."""
+
+    def test_csv_to_file_matches_string(self):
+        """Test that writing CSV to a file produces the same text as the returned string."""
+        results = _sample_results()
+        file = StringIO()
+
+        assert export_csv(results, file) == ""
+        assert file.getvalue() == export_csv(results)
+        assert len(file.getvalue().splitlines()) == 3
+
+    def test_json_to_file_matches_string(self):
+        """Test that writing JSON to a file produces the same text as the returned string."""
+        results = _sample_results()
+        file = StringIO()
+
+        assert export_json(results, file) == ""
+        assert file.getvalue() == export_json(results)
@@ -0,0 +1,484 @@
+"""
+Unit tests for the Profiler core.
+
+These tests cover block registration, statistics recording and result snapshots.
+"""
+
+import asyncio
+import os
+import subprocess
+import sys
+import threading
+import time
+
+import pytest
+
+from stichotrope import Profiler, set_global_enabled
+
+
+class TestBlockStatistics:
+    """Test per-block statistics storage."""
+
+    def test_record_updates_statistics(self):
+        """Test that recorded times update hits, total, min and max."""
+        profiler = Profiler("StatsTest")
+        block_idx = profiler._register_block(0, "block", "test.py", 1)
+
+        for elapsed in (300, 100, 200):
+            profiler._record_block_time(0, block_idx, elapsed)
+
+        block = profiler.get_results().tracks[0].blocks[block_idx]
+        assert block.hit_count == 3
+        assert block.total_time_ns == 600
+        assert block.min_time_ns == 100
+        assert block.max_time_ns == 300
+
+    def test_unsampled_totals_stay_exact(self):
+        """Test that totals beyond float precision are reported exactly without sampling."""
+        profiler = Profiler("ExactTest")
+        block_idx = profiler._register_block(0, "block", "test.py", 1)
+
+        profiler._record_block_time(0, block_idx, 2**53 + 1)
+        profiler._record_block_time(0, block_idx, 2)
+
+        block = profiler.get_results().tracks[0].blocks[block_idx]
+        assert block.total_time_ns == 2**53 + 3
+        assert block.hit_count == profiler.get_hit_count(0, block_idx) == 2
+
+    def test_profilers_do_not_share_call_sites(self):
+        """Test that two profilers instrumenting the same call site keep separate blocks."""
+        profilers = [Profiler("First"), Profiler("Second")]
+
+        for profiler in profilers:
+            with profiler.block(0, "shared_site"):
+                pass
+
+        for profiler in profilers:
+            track = profiler.get_results().tracks[0]
+            assert len(track.blocks) == 1
+            assert track.blocks[0].hit_count == 1
+
+    def test_results_are_snapshots(self):
+        """Test that results are not modified by later measurements."""
+        profiler = Profiler("SnapshotTest")
+
+        @profiler.track(0, "func")
+        def func():
+            return 42
+
+        func()
+        results = profiler.get_results()
+        func()
+
+        assert results.tracks[0].blocks[0].hit_count == 1
+        assert profiler.get_results().tracks[0].blocks[0].hit_count == 2
+
+    def test_hit_count_matches_results(self):
+        """Test that get_hit_count() agrees with get_results() and handles unknown blocks."""
+        profiler = Profiler("HitCountTest", sample_rate=0.5)
+
+        for _ in range(10):
+            with profiler.block(0, "first"):
+                pass
+        with profiler.block(0, "second"):
+            pass
+
+        blocks = profiler.get_results().tracks[0].blocks
+        assert profiler.get_hit_count(0, 0) == blocks[0].hit_count == 10
+        assert profiler.get_hit_count(0, 1) == blocks[1].hit_count
+        assert profiler.get_hit_count(0, 2) == 0
+        assert profiler.get_hit_count(1, 0) == 0
+
+    def test_clear_keeps_decorated_functions_recording(self):
+        """Test that decorated functions keep recording after clear()."""
+        profiler = Profiler("ClearTest")
+
+        @profiler.track(0, "func")
+        def func():
+            return 42
+
+        func()
+        profiler.clear()
+        assert profiler.get_results().tracks[0].blocks[0].hit_count == 0
+
+        func()
+        assert profiler.get_results().tracks[0].blocks[0].hit_count == 1
+
+
+class TestBlockContextManager:
+    """Test the block() context manager."""
+
+    def test_call_site_records_into_one_block(self):
+        """Test that repeated entries at one call site all record into the same block."""
+        profiler = Profiler("ReuseTest")
+
+        for _ in range(3):
+            with profiler.block(0, "loop"):
+                pass
+
+        blocks = profiler.get_results().tracks[0].blocks
+        assert len(blocks) == 1
+        assert blocks[0].hit_count == 3
+
+    def test_call_site_reuses_its_context(self):
+        """Test that sequential entries reuse one context and overlapping ones get their own."""
+        profiler = Profiler("ContextReuseTest")
+
+        def enter(count):
+            entered = [profiler.block(0, "site") for _ in range(count)]
+            for context in entered:
+                context.__enter__()
+            for context in reversed(entered):
+                context.__exit__(None, None, None)
+            return entered
+
+        first = enter(1)
+        assert enter(1) == first
+
+        # Two entries in flight need two contexts, both reused afterwards
+        overlapping = enter(2)
+        assert overlapping[0] is first[0]
+        assert enter(2) == overlapping
+        assert profiler.get_hit_count(0, 0) == 6
+
+    def test_overlapping_entries_on_one_thread(self):
+        """Test that interleaved asyncio tasks in one block are each timed from their own entry."""
+        profiler = Profiler("AsyncTest")
+
+        async def task(start_delay, duration):
+            await asyncio.sleep(start_delay)
+            with profiler.block(0, "task"):
+                await asyncio.sleep(duration)
+
+        async def main():
+            # Entries overlap without nesting: 0-20 ms and 10-50 ms
+            await asyncio.gather(task(0, 0.02), task(0.01, 0.04))
+
+        asyncio.run(main())
+
+        block = profiler.get_results().tracks[0].blocks[0]
+        assert block.hit_count == 2
+        assert 19_000_000 <= block.min_time_ns < 35_000_000
+        assert 39_000_000 <= block.max_time_ns < 48_000_000
+
+    def test_exit_on_another_thread(self):
+        """Test that a block entered in one thread and exited in another is recorded."""
+        profiler = Profiler("HandoffTest")
+
+        def generator():
+            with profiler.block(0, "handoff"):
+                yield
+
+        gen = generator()
+        next(gen)
+        thread = threading.Thread(target=next, args=(gen, None))
+        thread.start()
+        thread.join()
+
+        assert profiler.get_results().tracks[0].blocks[0].hit_count == 1
+
+    def test_call_sites_in_one_function_are_separate_blocks(self):
+        """Test that block() calls on different lines of one function get their own blocks."""
+        profiler = Profiler("SitesTest")
+
+        for _ in range(2):
+            with profiler.block(0, "first"):
+                pass
+            with profiler.block(0, "second"):
+                pass
+
+        blocks = profiler.get_results().tracks[0].blocks
+        assert [block.name for block in blocks.values()] == ["first", "second"]
+        assert blocks[0].line != blocks[1].line
+        assert all(block.hit_count == 2 for block in blocks.values())
+
+    def test_reentrant_block(self):
+        """Test that a block re-entered recursively records every entry."""
+        profiler = Profiler("RecursionTest")
+
+        def recurse(depth):
+            with profiler.block(0, "recurse"):
+                if depth > 0:
+                    recurse(depth - 1)
+
+        recurse(4)
+
+        block = profiler.get_results().tracks[0].blocks[0]
+        assert block.hit_count == 5
+        assert block.max_time_ns >= block.min_time_ns
+
+
+class TestTrackDecorator:
+    """Test the track() decorator."""
+
+    def test_stop_and_track_disable_skip_recording(self):
+        """Test that stop() and set_track_enabled() apply to already-decorated functions."""
+        profiler = Profiler("ToggleTest")
+
+        @profiler.track(0, "func")
+        def func():
+            return 42
+
+        profiler.stop()
+        assert func() == 42
+        profiler.start()
+        profiler.set_track_enabled(0, False)
+        assert func() == 42
+        profiler.set_track_enabled(0, True)
+        func()
+
+        assert profiler.get_results().tracks[0].blocks[0].hit_count == 1
+
+    def test_functions_with_and_without_parameters(self):
+        """Test that decorated functions with and without parameters keep their behavior."""
+        profiler = Profiler("SignatureTest")
+
+        @profiler.track(0)
+        def no_args():
+            return 42
+
+        @profiler.track(0)
+        def with_args(a, b=2, *, c=3):
+            return a + b + c
+
+        assert no_args() == 42
+        assert no_args.__name__ == "no_args"
+        with pytest.raises(TypeError):
+            no_args(1)
+        assert with_args(1, c=10) == 13
+
+        hits = [block.hit_count for block in profiler.get_results().tracks[0].blocks.values()]
+        assert hits == [1, 1]
+
+
+class TestGlobalDisable:
+    """Test the module-level disable switch."""
+
+    def test_global_disable_stops_decorated_functions(self):
+        """Test that disabling globally stops functions decorated while enabled."""
+        profiler = Profiler("GlobalToggleTest")
+
+        @profiler.track(0, "func")
+        def func():
+            return 42
+
+        set_global_enabled(False)
+        try:
+            assert func() == 42
+        finally:
+            set_global_enabled(True)
+        func()
+
+        assert profiler.get_results().tracks[0].blocks[0].hit_count == 1
+
+    def test_environment_variable_disables_profiling(self):
+        """Test that STICHOTROPE_DISABLED=1 starts the process with profiling disabled."""
+        code = "import stichotrope; print(stichotrope.is_global_enabled())"
+        env = dict(os.environ, STICHOTROPE_DISABLED="1")
+
+        output = subprocess.run(
+            [sys.executable, "-c", code], env=env, capture_output=True, text=True, check=True
+        ).stdout
+
+        assert output.strip() == "False"
+
+
+class TestSampling:
+    """Test sample-based profiling."""
+
+    def test_sampled_decorator_scales_results(self):
+        """Test that a sampling profiler times 1 in N calls and scales hits back up."""
+        profiler = Profiler("SampledTest", sample_rate=0.25)
+
+        @profiler.track(0, "func")
+        def func():
+            return 42
+
+        for _ in range(100):
+            assert func() == 42
+
+        assert profiler._thread_data().hits[0] == 25
+        assert profiler.get_results().tracks[0].blocks[0].hit_count == 100
+
+    def test_sampled_block_scales_results(self):
+        """Test that sampling also applies to block() context managers."""
+        profiler = Profiler("SampledBlockTest", sample_rate=0.1)
+
+        for _ in range(50):
+            with profiler.block(0, "loop"):
+                pass
+
+        assert profiler._thread_data().hits[0] == 5
+        assert profiler.get_results().tracks[0].blocks[0].hit_count == 50
+
+    @pytest.mark.parametrize("sample_rate", [0.0, -0.5, 1.5])
+    def test_invalid_sample_rate(self, sample_rate):
+        """Test that sample rates outside (0, 1] are rejected."""
+        with pytest.raises(ValueError):
+            Profiler("InvalidTest", sample_rate=sample_rate)
+
+
+class _CountingLock:
+    """Lock wrapper counting acquisitions, to check which paths take a profiler's lock."""
+
+    def __init__(self, lock):
+        self._lock = lock
+        self.acquires = 0
+
+    def acquire(self, *args, **kwargs):
+        self.acquires += 1
+        return self._lock.acquire(*args, **kwargs)
+
+    def release(self):
+        self._lock.release()
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.release()
+
+
+class TestThreads:
+    """Test recording from several threads."""
+
+    def test_recording_takes_no_lock(self):
+        """Test that once a thread and its call sites are registered, recording is lock-free."""
+        profiler = Profiler("LockFreeTest")
+
+        @profiler.track(0, "func")
+        def func(value):
+            return value
+
+        def worker():
+            for _ in range(100):
+                func(1)
+                with profiler.block(0, "block"):
+                    pass
+
+        # First pass registers the thread and the block() call site
+        worker()
+        lock = profiler._lock = _CountingLock(profiler._lock)
+        worker()
+
+        assert lock.acquires == 0
+        assert profiler.get_results().tracks[0].blocks[0].hit_count == 200
+
+    @pytest.mark.parametrize("num_threads", [2, 8, 32])
+    def test_concurrent_decorated_calls_are_all_counted(self, num_threads):
+        """Test that hits recorded concurrently by several threads are not lost."""
+        profiler = Profiler("ThreadCountTest")
+        calls = 1000
+
+        @profiler.track(0, "func")
+        def func():
+            return 42
+
+        recorded = threading.Barrier(num_threads + 1)
+        release = threading.Barrier(num_threads + 1)
+
+        def worker():
+            for _ in range(calls):
+                func()
+            recorded.wait()
+            release.wait()
+
+        threads = [threading.Thread(target=worker) for _ in range(num_threads)]
+        for thread in threads:
+            thread.start()
+
+        # While the workers are alive, each has its own statistics
+        recorded.wait()
+        assert len(profiler._all_thread_data) == num_threads
+        assert profiler.get_results().tracks[0].blocks[0].hit_count == num_threads * calls
+        release.wait()
+        for thread in threads:
+            thread.join()
+
+        assert profiler.get_results().tracks[0].blocks[0].hit_count == num_threads * calls
+
+    def test_exited_threads_are_retired(self):
+        """Test that statistics of exited threads are folded in and leave the registry."""
+        profiler = Profiler("RetireTest")
+
+        @profiler.track(0, "func")
+        def func():
+            time.sleep(0)
+
+        def worker():
+            for _ in range(10):
+                func()
+
+        for _ in range(50):
+            threads = [threading.Thread(target=worker) for _ in range(10)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            assert len(profiler._all_thread_data) <= 10
+
+        block = profiler.get_results().tracks[0].blocks[0]
+        assert block.hit_count == 5000
+        assert 0 < block.min_time_ns <= block.max_time_ns
+        assert len(profiler._all_thread_data) <= 10
+
+    def test_toggling_while_blocks_are_registered(self):
+        """Test that start/stop racing with block registration leaves consistent flags."""
+
+        def run_round():
+            profiler = Profiler("ToggleTest")
+            registered = threading.Event()
+
+            def worker(index):
+                for line in range(2000):
+                    profiler._get_block_id(index % 2, "block", f"worker{index}.py", line)
+                registered.set()
+
+            threads = [threading.Thread(target=worker, args=(i,)) for i in range(4)]
+            for thread in threads:
+                thread.start()
+            try:
+                while not registered.is_set():
+                    profiler.stop()
+                    profiler.set_track_enabled(1, False)
+                    profiler.start()
+                    profiler.set_track_enabled(1, True)
+                profiler.stop()
+            finally:
+                for thread in threads:
+                    thread.join()
+
+            # Every block registered, and none left active by a lost stop()
+            assert len(profiler._active) == len(profiler._block_meta) == 8000
+            assert not any(profiler._active)
+
+        # Switch threads as often as possible, so toggles interleave with registrations
+        interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+        try:
+            for _ in range(20):
+                run_round()
+        finally:
+            sys.setswitchinterval(interval)
+
+    def test_shared_block_times_each_thread_separately(self):
+        """Test that threads inside the same block() call site pair their own start times."""
+        profiler = Profiler("ThreadBlockTest")
+        barrier = threading.Barrier(4)
+
+        def worker(index):
+            barrier.wait()
+            with profiler.block(0, "shared"):
+                time.sleep(0.01 * (index + 1))
+
+        threads = [threading.Thread(target=worker, args=(i,)) for i in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        block = profiler.get_results().tracks[0].blocks[0]
+        assert block.hit_count == 4
+        assert block.min_time_ns >= 9_000_000
+        assert block.max_time_ns >= 39_000_000
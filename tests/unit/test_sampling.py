@@ -0,0 +1,63 @@
+"""
+Unit tests for the sampling profiler.
+"""
+
+import signal
+
+import pytest
+
+from stichotrope import SamplingProfiler
+
+pytestmark = pytest.mark.skipif(
+    not hasattr(signal, "setitimer"), reason="SamplingProfiler requires signal.setitimer"
+)
+
+
+def busy_work():
+    total = 0
+    for i in range(3_000_000):
+        total += i * i
+    return total
+
+
+class TestSamplingProfiler:
+    """Test SamplingProfiler."""
+
+    def test_samples_running_function(self):
+        """Test that a CPU-bound function shows up in the sampled results."""
+        profiler = SamplingProfiler("SamplingTest", sampling_hz=1000)
+
+        profiler.start()
+        try:
+            busy_work()
+        finally:
+            profiler.stop()
+
+        assert profiler.total_samples > 0
+        names = [block.name for block in profiler.get_results().tracks[0].blocks.values()]
+        assert "busy_work" in names
+
+    def test_stop_restores_previous_handler(self):
+        """Test that stop() restores the SIGPROF handler that was installed before."""
+        previous = signal.getsignal(signal.SIGPROF)
+        profiler = SamplingProfiler()
+
+        profiler.start()
+        profiler.stop()
+
+        assert signal.getsignal(signal.SIGPROF) == previous
+        assert not profiler.is_started()
+
+    def test_clear(self):
+        """Test that clear() drops all samples."""
+        profiler = SamplingProfiler()
+        profiler._sample(signal.SIGPROF, None)
+        profiler.clear()
+
+        assert profiler.total_samples == 0
+        assert profiler.get_results().tracks == {}
+
+    def test_invalid_rate(self):
+        """Test that a non-positive sampling rate is rejected."""
+        with pytest.raises(ValueError):
+            SamplingProfiler(sampling_hz=0)
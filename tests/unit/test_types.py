@@ -0,0 +1,28 @@
+"""
+Unit tests for the result data structures.
+"""
+
+import sys
+
+import pytest
+
+from stichotrope import ProfileBlock, ProfilerResults, ProfileTrack
+
+
+@pytest.mark.skipif(sys.version_info < (3, 10), reason="dataclass slots require Python 3.10+")
+class TestSlots:
+    """Test that result objects carry no per-instance __dict__."""
+
+    @pytest.mark.parametrize(
+        "instance",
+        [
+            ProfileBlock(name="block", file="test.py", line=1),
+            ProfileTrack(track_idx=0),
+            ProfilerResults(profiler_name="SlotsTest"),
+        ],
+    )
+    def test_no_instance_dict(self, instance):
+        """Test that instances are slotted."""
+        assert not hasattr(instance, "__dict__")
+        with pytest.raises(AttributeError):
+            instance.unexpected_attribute = 1